@@ -395,6 +395,8 @@ class BonkBoiEvents:
 
     def create_bonus_trigger_event(self, gamestate, bonus_type, trigger_symbols, trigger_win, spins_received):
         """Create BONUS_TRIGGER event"""
+        if not gamestate.write_books:
+            return None
         # Generate unique bonus session ID
         bonus_session_id = f"bonus_{len(gamestate.book.events)}_{bonus_type}"
         
@@ -423,7 +425,7 @@ class BonkBoiEvents:
             "gameType": gamestate.gametype,
             "bonusSessionId": bonus_session_id,
             "reelSet": reel_set,
-            "triggerSymbols": trigger_symbols,
+            "triggerSymbols": list(trigger_symbols),
             "triggerWin": actual_trigger_win,  # Use calculated trigger win
             "sessionWin": float(actual_trigger_win),  # Convert to float for consistency
             "spinsReceived": spins_received,
@@ -443,6 +445,8 @@ class BonkBoiEvents:
 
     def create_bonus_spin_event(self, gamestate, spin_number, bonus_session_id, reel_set, spin_win, total_bonus_win, spins_received, spins_left):
         """Create BONUS_SPIN event"""
+        if not gamestate.write_books:
+            return None
         # Determine actual reel set based on CURRENT bonus type (not session_id which doesn't update after upgrade)
         if gamestate.events.bonus_state and gamestate.events.bonus_state["type"] == "SUPER_BONK_SPINS":
             actual_reel_set = "BON2"  # SUPER_BONK_SPINS uses BON2 reels
@@ -477,6 +481,8 @@ class BonkBoiEvents:
 
     def create_bonus_complete_event(self, gamestate, bonus_session_id, total_bonus_win, spins_completed, bonus_type, final_multiplier):
         """Create BONUS_COMPLETE event"""
+        if not gamestate.write_books:
+            return None
         
         # CRITICAL: Calculate proper sessionWin for final event
         # For bonus hunt mode, include base game win in sessionWin
@@ -616,6 +622,7 @@ class BonkBoiEvents:
 
 def reveal_event_bonk_boi(gamestate):
     """Create reveal event for Bonk Boi game"""
+    # Recorded when books are not written as well, the first buy bonus reveal is detected from the book events
     # Check if this is buy bonus mode and first reveal
     current_betmode = gamestate.get_current_betmode()
     is_buy_bonus = current_betmode and current_betmode.get_buybonus()
@@ -653,7 +660,7 @@ def reveal_event_bonk_boi(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.padding_position,
+        "paddingPositions": list(gamestate.padding_position),
         "gameType": gamestate.gametype,
         "anticipation": [0, 0]
     }
@@ -18,7 +18,13 @@ class GameStateOverride(GameExecutables):
         self.bonus_session_id = None
         # Reset Horny_Jail processing flag
         self._horny_jail_processed = False
-        
+        # Reset bonus upgrade tracking and bonus events, otherwise they carry over into the next simulation
+        self.needs_upgrade_bonus_trigger = False
+        self.upgrade_bonus_trigger_created = False
+        self.upgrade_trigger_symbols = None
+        if hasattr(self, "events"):
+            self.events.reset_to_base_game()
+
         # Reset win_manager for new simulation
         if hasattr(self, 'win_manager'):
             self.win_manager.reset_end_round_wins()
@@ -62,8 +68,7 @@ class GameStateOverride(GameExecutables):
             sticky_reel = self.events.bonus_state.get('sticky_reel')
             self.board = self.create_sticky_board_from_reel_strips(sticky_reel)
             # Set padding positions for events
-            import random
-            self.padding_position = [random.randint(0, 50000), random.randint(0, 50000)]
+            self.padding_position = [self.rng.randint(0, 50000), self.rng.randint(0, 50000)]
         else:
             # Use regular reel logic
             self.create_regular_board_from_reel_strips()
@@ -78,27 +83,23 @@ class GameStateOverride(GameExecutables):
         reel2_symbols = self.current_reel_strips[1]  # Second reel
         
         # Select random symbols from each reel
-        import random
-        
         # First reel
-        symbol1_name = random.choice(reel1_symbols)
+        symbol1_name = self.rng.choice(reel1_symbols)
         symbol1_obj = type('Symbol', (), {'name': str(symbol1_name)})()
         self.board.append([symbol1_obj])
         
         # Second reel
-        symbol2_name = random.choice(reel2_symbols)
+        symbol2_name = self.rng.choice(reel2_symbols)
         symbol2_obj = type('Symbol', (), {'name': str(symbol2_name)})()
         self.board.append([symbol2_obj])
 
         # Set padding positions for events
-        self.padding_position = [random.randint(0, 50000), random.randint(0, 50000)]
+        self.padding_position = [self.rng.randint(0, 50000), self.rng.randint(0, 50000)]
 
     def create_sticky_board_from_reel_strips(self, sticky_reel):
         """
         Create a board with one sticky reel (BON2_stick) and one non-sticky reel (BON2_run)
         """
-        import random
-        
         # Get sticky reel symbols (BON2_stick.csv - only numeric)
         all_sticky_reel_strips = self.config.reels.get("BON2_stick", [])
         if not all_sticky_reel_strips:
@@ -119,8 +120,8 @@ class GameStateOverride(GameExecutables):
         # Create board with sticky and non-sticky reels
         if sticky_reel == 0:
             # Sticky reel is first reel (index 0)
-            symbol1_name = random.choice(sticky_reel_symbols)
-            symbol2_name = random.choice(non_sticky_reel_symbols)
+            symbol1_name = self.rng.choice(sticky_reel_symbols)
+            symbol2_name = self.rng.choice(non_sticky_reel_symbols)
             
             symbol1_obj = type('Symbol', (), {'name': str(symbol1_name)})()
             symbol2_obj = type('Symbol', (), {'name': str(symbol2_name)})()
@@ -131,8 +132,8 @@ class GameStateOverride(GameExecutables):
             ]
         else:
             # Sticky reel is second reel (index 1)
-            symbol1_name = random.choice(non_sticky_reel_symbols)
-            symbol2_name = random.choice(sticky_reel_symbols)
+            symbol1_name = self.rng.choice(non_sticky_reel_symbols)
+            symbol2_name = self.rng.choice(sticky_reel_symbols)
             
             symbol1_obj = type('Symbol', (), {'name': str(symbol1_name)})()
             symbol2_obj = type('Symbol', (), {'name': str(symbol2_name)})()
@@ -162,7 +163,7 @@ class GameStateOverride(GameExecutables):
 
     def assign_mult_property(self, symbol):
         multiplier_value = get_random_outcome(
-            self.get_current_distribution_conditions()["mult_values"][self.gametype]
+            self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
         )
         symbol.multiplier = multiplier_value
 
@@ -184,8 +185,7 @@ class GameStateOverride(GameExecutables):
         
         # Second reel: spin normally from Horny_Jail reel set
         horny_jail_symbols = self.config.reels["Horny_Jail"][1]  # Use second reel symbols
-        import random
-        random_symbol = random.choice(horny_jail_symbols)
+        random_symbol = self.rng.choice(horny_jail_symbols)
         symbol_obj = type('Symbol', (), {'name': str(random_symbol)})()
         self.board.append([symbol_obj])
         
@@ -200,8 +200,7 @@ class GameStateOverride(GameExecutables):
         self.free_game_win = 0.0
         
         # Set random padding positions for events (like other modes)
-        import random
-        self.padding_position = [random.randint(0, 500), random.randint(0, 500)]
+        self.padding_position = [self.rng.randint(0, 500), self.rng.randint(0, 500)]
         
         # Set board in game state
         self.current_board = self.board
@@ -925,7 +925,7 @@ class GameState(GameStateOverride):
                 bonus_spin_event["stickReel"] = sticky_reel
         
         # Check if maxwin was reached in this spin
-        if bonus_state.get("maxwin_reached", False):
+        if bonus_spin_event and bonus_state.get("maxwin_reached", False):
             bonus_spin_event["maxWinReached"] = True
 
         # Add the bonus spin event to the book
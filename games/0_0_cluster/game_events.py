@@ -1,14 +1,15 @@
-from copy import deepcopy
+from src.events.events import book_event
 
 APPLY_TUMBLE_MULTIPLIER = "applyMultiplierToTumble"
 UPDATE_GRID = "updateGrid"
 
 
+@book_event
 def update_grid_mult_event(gamestate):
     """Pass updated position multipliers after a win."""
     event = {
         "index": len(gamestate.book.events),
         "type": UPDATE_GRID,
-        "gridMultipliers": deepcopy(gamestate.position_multipliers),
+        "gridMultipliers": [list(reel) for reel in gamestate.position_multipliers],
     }
     gamestate.book.add_event(event)
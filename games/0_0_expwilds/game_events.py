@@ -1,8 +1,7 @@
 """Events specific to new and updating expanding wild symbols."""
 
-from copy import deepcopy
 from src.events.event_constants import EventConstants
-from src.events.events import json_ready_sym
+from src.events.events import book_event, json_ready_sym
 
 NEW_EXP_WILDS = "newExpandingWilds"
 UPDATE_EXP_WILDS = "updateExpandingWilds"
@@ -11,31 +10,28 @@ WIN_DATA = "winInfo"
 PRIZE_WIN_DATA = "prizeWinInfo"
 
 
+@book_event
 def new_expanding_wild_event(gamestate) -> None:
     """Passed after reveal event"""
-    new_exp_wilds = gamestate.new_exp_wilds
-    if gamestate.config.include_padding:
-        for ew in new_exp_wilds:
-            ew["row"] += 1
+    row_offset = 1 if gamestate.config.include_padding else 0
+    new_exp_wilds = [{**ew, "row": ew["row"] + row_offset} for ew in gamestate.new_exp_wilds]
 
     event = {"index": len(gamestate.book.events), "type": NEW_EXP_WILDS, "newWilds": new_exp_wilds}
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_expanding_wild_event(gamestate) -> None:
     """On each reveal - the multiplier value on the expanding wild is updated (sent before reveal)"""
-    existing_wild_details = deepcopy(gamestate.expanding_wilds)
     wild_event = []
     if gamestate.config.include_padding:
-        for ew in existing_wild_details:
-            if len(ew) > 0:
-                ew["row"] += 1
-                wild_event.append(ew)
+        wild_event = [{**ew, "row": ew["row"] + 1} for ew in gamestate.expanding_wilds if len(ew) > 0]
 
     event = {"index": len(gamestate.book.events), "type": UPDATE_EXP_WILDS, "existingWilds": wild_event}
     gamestate.book.add_event(event)
 
 
+@book_event
 def new_sticky_event(gamestate, new_sticky_syms: list):
     """Pass details on new prize symbols"""
     if gamestate.config.include_padding:
@@ -47,14 +43,13 @@ def new_sticky_event(gamestate, new_sticky_syms: list):
     gamestate.book.add_event(event)
 
 
+@book_event
 def win_info_prize_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
-    win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
     prize_details = []
-    for _, w in enumerate(win_data_copy["wins"]):
+    for w in gamestate.win_data["wins"]:
         if include_padding_index:
             prize_details.append({"reel": w["reel"], "row": w["row"] + 1, "prize": int(100 * w["value"])})
         else:
@@ -69,6 +64,7 @@ def win_info_prize_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@book_event
 def reveal_prize_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -94,8 +90,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
@@ -21,14 +21,16 @@ class GameStateOverride(GameExecutables):
         """Only assign multiplier values in freegame"""
         if self.gametype != self.config.basegame_type:
             multiplier_value = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
             )
             symbol.assign_attribute({"multiplier": multiplier_value})
 
     def assign_prize_value(self, symbol):
         """Only assign multiplier values in freegame"""
         # if self.gametype != self.config.basegame_type:
-        multiplier_value = get_random_outcome(self.get_current_distribution_conditions()["prize_values"])
+        multiplier_value = get_random_outcome(
+            self.get_current_distribution_conditions()["prize_values"], rng=self.rng
+        )
         symbol.assign_attribute({"prize": multiplier_value})
 
     def check_repeat(self) -> None:
@@ -1,12 +1,21 @@
 from game_calculations import GameCalculations
-from src.calculations.lines import Lines
+from src.calculations.lines import Lines, CompiledLines
 
 
 class GameExecutables(GameCalculations):
 
+    compiled_lines = None
+
     def evaluate_lines_board(self):
         """Populate win-data, record wins, transmit events."""
-        self.win_data = Lines.get_lines(self.board, self.config, global_multiplier=self.global_multiplier)
+        if self.config.compact_board:
+            if self.compiled_lines is None:
+                self.compiled_lines = CompiledLines(self.config, self.symbol_encoder)
+            self.win_data = self.compiled_lines.get_lines(
+                self.board, global_multiplier=self.global_multiplier, board_ids=self.get_board_ids()
+            )
+        else:
+            self.win_data = Lines.get_lines(self.board, self.config, global_multiplier=self.global_multiplier)
         Lines.record_lines_wins(self)
         self.win_manager.update_spinwin(self.win_data["totalWin"])
         Lines.emit_linewin_events(self)
@@ -19,13 +19,14 @@ class GameState(GameStateOverride):
             self.win_manager.update_spinwin(win_data["totalWin"])
             self.win_manager.update_gametype_wins(self.gametype)
 
-            game_event = {
-                "index": len(self.book.events),
-                "type": EventConstants.WIN_DATA.value,
-                "numberRolled": int(sim + 1),
-                "totalWin": int(round(win_data["totalWin"] * 100, 0)),
-            }
-            self.book.add_event(game_event)
+            if self.write_books:
+                game_event = {
+                    "index": len(self.book.events),
+                    "type": EventConstants.WIN_DATA.value,
+                    "numberRolled": int(sim + 1),
+                    "totalWin": int(round(win_data["totalWin"] * 100, 0)),
+                }
+                self.book.add_event(game_event)
 
             self.evaluate_finalwin()
 
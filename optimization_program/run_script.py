@@ -2,6 +2,7 @@ import json
 import subprocess
 import os
 from src.config.paths import PATH_TO_GAMES, SETUP_PATH, OPTIMIZATION_PATH, PROJECT_PATH
+from src.write_data.lookup_table import write_binary_lookup
 
 
 class OptimizationExecution:
@@ -47,6 +48,9 @@ class OptimizationExecution:
         setup_file.close()
         print(f"Running optimization for mode: {mode}")
         OptimizationExecution.run_rust_script()
+        write_binary_lookup(
+            os.path.join(PATH_TO_GAMES, game_config.game_id, "library", "publish_files", f"lookUpTable_{mode}_0.csv")
+        )
 
     @staticmethod
     def run_all_modes(game_config, modes_to_run, rust_threads):
@@ -1,6 +1,5 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
@@ -12,19 +11,24 @@ class Board(GeneralGameState):
 
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
+        if self.config.compact_board:
+            self.create_compact_board_reelstrips()
+            return
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        reel_positions = [
+            self.rng.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)
+        ]
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
@@ -83,6 +87,81 @@ class Board(GeneralGameState):
             else:
                 self.increment_spin_count("base")
 
+    def create_compact_board_reelstrips(self) -> None:
+        """
+        create_board_reelstrips() from the symbol-id reelstrips, drawing the same random values in the same order.
+        The drawn ids are kept in self.board_ids. Special symbols and symbols with special functions are created
+        for each board position, all other positions of self.board share one Symbol per name and must not be modified.
+        """
+        if self.config.include_padding:
+            top_symbols = []
+            bottom_symbols = []
+        self.refresh_special_syms()
+        self.reelstrip_id = get_random_outcome(
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
+        )
+        self.reelstrip = self.config.reels[self.reelstrip_id]
+        encoded_reels = self.encoded_reels[self.reelstrip_id]
+        anticipation = [0] * self.config.num_reels
+        board = [[]] * self.config.num_reels
+        board_ids = [[]] * self.config.num_reels
+        reel_positions = [
+            self.rng.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)
+        ]
+        padding_positions = [0] * self.config.num_reels
+        first_scatter_reel = -1
+        for reel in range(self.config.num_reels):
+            reel_pos = reel_positions[reel]
+            reel_ids = encoded_reels[reel]
+            num_rows = self.config.num_rows[reel]
+            if self.config.include_padding:
+                top_symbols.append(self.get_compact_symbol(reel_ids[(reel_pos - 1) % len(reel_ids)]))
+                bottom_symbols.append(self.get_compact_symbol(reel_ids[(reel_pos + num_rows) % len(reel_ids)]))
+            board_ids[reel] = [reel_ids[(reel_pos + row) % len(reel_ids)] for row in range(num_rows)]
+            board[reel] = [self.get_compact_symbol(sym_id) for sym_id in board_ids[reel]]
+            for row, sym in enumerate(board[reel]):
+                if sym.special:
+                    for special_symbol in self.special_syms_on_board:
+                        for s in self.config.special_symbols[special_symbol]:
+                            if sym.name == s:
+                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
+                                if (
+                                    sym.check_attribute("scatter")
+                                    and len(self.special_syms_on_board[special_symbol])
+                                    >= self.config.anticipation_triggers[self.gametype]
+                                    and first_scatter_reel == -1
+                                ):
+                                    first_scatter_reel = reel + 1
+            padding_positions[reel] = (reel_pos + num_rows + 1) % len(reel_ids)
+
+        if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
+            count = 1
+            for reel in range(first_scatter_reel, self.config.num_reels):
+                anticipation[reel] = count
+                count += 1
+
+        for r in range(1, self.config.num_reels):
+            if anticipation[r - 1] > anticipation[r]:
+                raise RuntimeError
+
+        self.board = board
+        self.board_ids = board_ids
+        self.get_special_symbols_on_board()
+        self.reel_positions = reel_positions
+        self.padding_position = padding_positions
+        self.anticipation = anticipation
+        if self.config.include_padding:
+            self.top_symbols = top_symbols
+            self.bottom_symbols = bottom_symbols
+
+        # Відстежуємо спін після створення дошки
+        if hasattr(self, 'increment_spin_count'):
+            # Визначаємо тип спіну на основі поточного gametype
+            if hasattr(self, 'gametype') and self.gametype == self.config.freegame_type:
+                self.increment_spin_count("free")
+            else:
+                self.increment_spin_count("base")
+
     def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
         """Creates a gameboard from specified stopping positions."""
         if self.config.include_padding:
@@ -98,10 +177,10 @@ class Board(GeneralGameState):
 
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
 
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
@@ -142,6 +221,7 @@ class Board(GeneralGameState):
                 count += 1
 
         self.board = board
+        self.board_ids = None
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
         self.anticipation = anticipation
@@ -168,6 +248,20 @@ class Board(GeneralGameState):
 
         return symObject
 
+    def get_compact_symbol(self, sym_id: int) -> object:
+        """Shared Symbol of a symbol id, or a new Symbol for special symbols and symbols with special functions."""
+        symbol = self.compact_symbols[sym_id]
+        if symbol is None:
+            return self.create_symbol(self.symbol_encoder.names[sym_id])
+        return symbol
+
+    def get_board_ids(self) -> List[List[int]]:
+        """Symbol-id grid of self.board, encoded from the board Symbols if the board was not drawn as a compact board."""
+        if self.board_ids is None:
+            ids = self.symbol_encoder.ids
+            self.board_ids = [[ids[sym.name] for sym in reel] for reel in self.board]
+        return self.board_ids
+
     def refresh_special_syms(self) -> None:
         """Reset recorded speical symbols on board."""
         self.special_syms_on_board = {}
@@ -215,7 +309,9 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
@@ -271,7 +367,7 @@ class Board(GeneralGameState):
         Helper function for forcing special (or name specific) symbols
         """
         reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
 
@@ -282,8 +378,8 @@ class Board(GeneralGameState):
         while len(force_stop_positions) != num_force_syms:
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
             possible_probs = [p for p in sym_prob if p > 0]
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
 
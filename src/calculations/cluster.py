@@ -10,6 +10,8 @@ from src.wins.multiplier_strategy import apply_mult
 class Cluster:
     """Collection of cluster-evaluation functions."""
 
+    neighbour_maps = {}
+
     @staticmethod
     def get_central_cluster_position(winning_positions: List[Dict]) -> tuple:
         """Return position on screen to display win amount."""
@@ -80,9 +82,78 @@ class Cluster:
                     wild_key,
                 )
 
+    @staticmethod
+    def get_neighbour_map(board: list[list[Symbol]]) -> tuple:
+        """
+        Flattened board positions and the neighbours of every position (as flat indices), in the order used
+        by get_neighbours(). Cached for each board shape.
+        """
+        board_shape = tuple(len(reel) for reel in board)
+        if board_shape not in Cluster.neighbour_maps:
+            positions = [(reel, row) for reel, num_rows in enumerate(board_shape) for row in range(num_rows)]
+            flat_index = {pos: idx for idx, pos in enumerate(positions)}
+            neighbour_map = []
+            for reel, row in positions:
+                neighbours = []
+                if reel > 0:
+                    neighbours.append(flat_index[(reel - 1, row)])
+                if reel < len(board_shape) - 1:
+                    neighbours.append(flat_index[(reel + 1, row)])
+                if row > 0:
+                    neighbours.append(flat_index[(reel, row - 1)])
+                if row < board_shape[reel] - 1:
+                    neighbours.append(flat_index[(reel, row + 1)])
+                neighbour_map.append(neighbours)
+            Cluster.neighbour_maps[board_shape] = (positions, neighbour_map)
+        return Cluster.neighbour_maps[board_shape]
+
     @staticmethod
     def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
-        """Return all symbol clusters of size >= 1."""
+        """
+        Return all symbol clusters of size >= 1.
+        Iterative depth-first search with grid-based membership, positions are returned in the same order as
+        the recursive search (get_clusters_recursive()).
+        """
+        positions, neighbour_map = Cluster.get_neighbour_map(board)
+        symbols = [sym for reel in board for sym in reel]
+        names = [sym.name for sym in symbols]
+        wilds = [sym.check_attribute(wild_key) for sym in symbols]
+        already_checked = [False] * len(symbols)
+        local_checked = [-1] * len(symbols)
+        clusters = defaultdict(list)
+        for start, symbol in enumerate(names):
+            if already_checked[start] or wilds[start]:
+                continue
+            potential_cluster = [start]
+            already_checked[start] = True
+            local_checked[start] = start
+            # each stack entry holds the neighbours first seen from a cluster position, and the next one to check
+            stack = [[neighbour_map[start], 0]]
+            for idx in neighbour_map[start]:
+                local_checked[idx] = start
+            while stack:
+                entry = stack[-1]
+                neighbours, next_idx = entry
+                if next_idx == len(neighbours):
+                    stack.pop()
+                    continue
+                idx = neighbours[next_idx]
+                entry[1] = next_idx + 1
+                if wilds[idx] or names[idx] == symbol:
+                    potential_cluster.append(idx)
+                    already_checked[idx] = True
+                    unseen = [n_idx for n_idx in neighbour_map[idx] if local_checked[n_idx] != start]
+                    for n_idx in unseen:
+                        local_checked[n_idx] = start
+                    stack.append([unseen, 0])
+
+            clusters[symbol].append([positions[idx] for idx in potential_cluster])
+
+        return clusters
+
+    @staticmethod
+    def get_clusters_recursive(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
+        """Reference recursive implementation of get_clusters()."""
         already_checked = []
         clusters = defaultdict(list)
         for reel, _ in enumerate(board):
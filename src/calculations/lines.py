@@ -1,6 +1,8 @@
 """Evaluates and records winds for lines games."""
 
+import numpy as np
 from src.calculations.symbol import Symbol
+from src.calculations.symbol_encoder import SymbolEncoder
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -76,47 +78,63 @@ class Lines:
 
             if base_win > 0 or wild_win > 0:
                 if wild_win > base_win:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=wild_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
+                    win_dict = Lines.line_win_dict(
+                        board,
+                        line_index,
+                        line,
                         potential_line[0].name,
                         wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": wild_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
+                        wild_win,
+                        multiplier_method,
+                        global_multiplier,
                     )
                 else:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, matches + wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=base_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
+                    win_dict = Lines.line_win_dict(
+                        board,
+                        line_index,
+                        line,
                         first_non_wild.name,
                         matches + wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": base_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
+                        base_win,
+                        multiplier_method,
+                        global_multiplier,
                     )
 
-                return_data["totalWin"] += line_win
+                return_data["totalWin"] += win_dict["win"]
                 return_data["wins"].append(win_dict)
 
         return return_data
 
+    @staticmethod
+    def line_win_dict(
+        board: list[list[Symbol]],
+        line_index: int,
+        line: list,
+        symbol: str,
+        kind: int,
+        win: float,
+        multiplier_method: str,
+        global_multiplier: int,
+    ) -> dict:
+        """Apply multipliers to a winning line and construct the line-win dictionary."""
+        positions = [{"reel": idx, "row": line[idx]} for idx in range(0, kind)]
+        line_win, applied_mult = apply_mult(
+            board, multiplier_method, global_multiplier=global_multiplier, win_amount=win, positions=positions
+        )
+        return Lines.line_win_info(
+            symbol,
+            kind,
+            line_win,
+            positions,
+            {
+                "lineIndex": line_index,
+                "multiplier": applied_mult,
+                "winWithoutMult": win,
+                "globalMult": int(global_multiplier),
+                "lineMultiplier": int(applied_mult / global_multiplier),
+            },
+        )
+
     @staticmethod
     def emit_linewin_events(gamestate) -> None:
         """Transmit win events asociated with lines wins."""
@@ -136,3 +154,127 @@ class Lines:
 
         for win in gamestate.win_data["wins"]:
             record_line(len(win["positions"]), win["symbol"], win["meta"]["multiplier"], gamestate.gametype)
+
+
+class CompiledLines:
+    """
+    Lines evaluation over integer symbol-id boards. Paylines, wild symbols and the paytable are converted to arrays
+    once. evaluate_batch() computes match lengths for all paylines of many boards at the same time with numpy,
+    get_lines() evaluates a single board over the same tables with plain lists, avoiding numpy per-call overhead.
+    Wild symbols are identified from config.special_symbols[wild_key] rather than the board Symbol attributes.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        symbol_encoder: SymbolEncoder,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+    ):
+        self.config = config
+        self.encoder = symbol_encoder
+        self.line_index = list(config.paylines.keys())
+        self.line_rows = np.array([config.paylines[idx] for idx in self.line_index], dtype=np.intp)
+        self.num_reels = self.line_rows.shape[1]
+        self.reel_index = np.arange(self.num_reels)
+        self.wild_mask = symbol_encoder.properties.get(wild_key, np.zeros(symbol_encoder.num_symbols, dtype=bool))
+        # paytable[symbol_id, kind], the trailing row holds the wild_sym payouts
+        self.paytable = np.zeros((symbol_encoder.num_symbols + 1, self.num_reels + 1))
+        for (kind, name), pay in config.paytable.items():
+            if kind <= self.num_reels:
+                if name in symbol_encoder.ids:
+                    self.paytable[symbol_encoder.ids[name], kind] = pay
+                if name == wild_sym:
+                    self.paytable[-1, kind] = pay
+        self.wild_sym = wild_sym
+        # list forms of the tables for single board evaluation
+        self.line_list = [(line_index, config.paylines[line_index]) for line_index in self.line_index]
+        self.wild_list = self.wild_mask.tolist()
+        self.paytable_list = self.paytable.tolist()
+
+    @staticmethod
+    def leading_count(mask: np.ndarray) -> np.ndarray:
+        """Number of consecutive True values from the start of the last axis."""
+        return np.where(mask.all(axis=-1), mask.shape[-1], mask.argmin(axis=-1))
+
+    def match_lines(self, board_ids: np.ndarray) -> tuple:
+        """Winning symbol id, kind, base payout and wild_sym payout flag for every board and payline."""
+        line_ids = board_ids[:, self.reel_index, self.line_rows]
+        is_wild = self.wild_mask[line_ids]
+        wild_matches = self.leading_count(is_wild)
+        has_non_wild = wild_matches < self.num_reels
+        first_pos = np.minimum(wild_matches, self.num_reels - 1)
+        first_non_wild = np.take_along_axis(line_ids, first_pos[..., None], axis=-1)[..., 0]
+        total_matches = self.leading_count(is_wild | (line_ids == first_non_wild[..., None]))
+
+        wild_win = self.paytable[-1, wild_matches]
+        base_win = np.where(has_non_wild, self.paytable[first_non_wild, total_matches], 0.0)
+        wild_pays = wild_win > base_win
+        win_symbol = np.where(wild_pays, line_ids[..., 0], first_non_wild)
+        win = np.maximum(wild_win, base_win)
+        kind = np.where(win > 0, np.where(wild_pays, wild_matches, total_matches), 0)
+        return win_symbol, kind, win, wild_pays
+
+    def evaluate_batch(self, board_ids: np.ndarray) -> tuple:
+        """
+        Evaluate the base (pre-multiplier) line wins of many boards with shape (boards, reels, rows).
+        Returns arrays of shape (boards, paylines): winning symbol id, kind and payout (0 for non-paying lines).
+        """
+        win_symbol, kind, win, _ = self.match_lines(board_ids)
+        return win_symbol, kind, win
+
+    def get_lines(
+        self,
+        board: list[list[Symbol]],
+        multiplier_method: str = "symbol",
+        global_multiplier: int = 1,
+        board_ids: list[list[int]] = None,
+    ) -> dict:
+        """Lines.get_lines() equivalent for a single board, board_ids can be passed when the id grid is already
+        available (a nested list or a (reels x rows) array)."""
+        if board_ids is None:
+            ids = self.encoder.ids
+            board_ids = [[ids[sym.name] for sym in reel] for reel in board]
+        elif isinstance(board_ids, np.ndarray):
+            board_ids = board_ids.tolist()
+        is_wild, paytable, num_reels = self.wild_list, self.paytable_list, self.num_reels
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        for line_index, line in self.line_list:
+            first_id = board_ids[0][line[0]]
+            wild_matches = 0
+            while wild_matches < num_reels and is_wild[board_ids[wild_matches][line[wild_matches]]]:
+                wild_matches += 1
+            wild_win, base_win = paytable[-1][wild_matches], 0.0
+            if wild_matches < num_reels:
+                first_non_wild = board_ids[wild_matches][line[wild_matches]]
+                matches = wild_matches + 1
+                while matches < num_reels:
+                    sym_id = board_ids[matches][line[matches]]
+                    if sym_id != first_non_wild and not is_wild[sym_id]:
+                        break
+                    matches += 1
+                base_win = paytable[first_non_wild][matches]
+            if wild_win <= 0 and base_win <= 0:
+                continue
+            if wild_win > base_win:
+                name, win_kind, pay_name = self.encoder.names[first_id], wild_matches, self.wild_sym
+            else:
+                name = pay_name = self.encoder.names[first_non_wild]
+                win_kind = matches
+            win_dict = Lines.line_win_dict(
+                board,
+                line_index,
+                line,
+                name,
+                win_kind,
+                self.config.paytable[(win_kind, pay_name)],
+                multiplier_method,
+                global_multiplier,
+            )
+            return_data["totalWin"] += win_dict["win"]
+            return_data["wins"].append(win_dict)
+
+        return return_data
@@ -1,13 +1,131 @@
 import random
 from typing import Union
+import numpy as np
 
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+class WeightedDistribution(dict):
+    """
+    Weighted distribution {value: weight, ...} with a precompiled alias table (Vose's method).
+    Behaves as a regular dict, any modification invalidates the table which is rebuilt on the next draw.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._table = None
+
+    def compile(self) -> None:
+        """Build alias table so that a draw costs one uniform number and one comparison."""
+        values = list(self.keys())
+        weights = [float(w) for w in self.values()]
+        num_values = len(values)
+        total_weight = sum(weights)
+        assert num_values > 0 and total_weight > 0, "distribution must contain a positive total weight"
+
+        scaled = [w * num_values / total_weight for w in weights]
+        prob = [1.0] * num_values
+        alias = list(range(num_values))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        self._table = (values, prob, alias, num_values)
+
+    def draw(self, rng: random.Random = random) -> Union[float, int, str]:
+        """Return a single weighted outcome."""
+        if self._table is None:
+            self.compile()
+        values, prob, alias, num_values = self._table
+        roll = rng.random() * num_values
+        idx = min(int(roll), num_values - 1)
+        if roll - idx < prob[idx]:
+            return values[idx]
+        return values[alias[idx]]
+
+    def draw_batch(self, size: int, generator: np.random.Generator = None) -> np.ndarray:
+        """Return an array of `size` weighted outcomes drawn at once from a numpy Generator."""
+        if self._table is None:
+            self.compile()
+        values, prob, alias, num_values = self._table
+        if generator is None:
+            generator = np.random.default_rng()
+        roll = generator.random(size) * num_values
+        idx = np.minimum(roll.astype(np.int64), num_values - 1)
+        chosen = np.where(roll - idx < np.asarray(prob)[idx], idx, np.asarray(alias)[idx])
+        return np.asarray(values)[chosen]
+
+    def _invalidate(self) -> None:
+        self._table = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(self, key, default=None):
+        self._invalidate()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._invalidate()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+
+def is_weight_table(item) -> bool:
+    """True for a non-empty {value: weight} dict with non-negative numeric weights and a positive total."""
+    return (
+        isinstance(item, dict)
+        and len(item) > 0
+        and all(isinstance(w, (int, float)) and not isinstance(w, bool) and w >= 0 for w in item.values())
+        and sum(item.values()) > 0
+    )
+
+
+def compile_weight_tables(item):
+    """Recursively replace {value: weight} dicts with compiled WeightedDistribution objects."""
+    if is_weight_table(item):
+        weighted = item if isinstance(item, WeightedDistribution) else WeightedDistribution(item)
+        weighted.compile()
+        return weighted
+    if isinstance(item, dict):
+        for key, val in item.items():
+            item[key] = compile_weight_tables(val)
+    return item
+
+
+def get_random_outcome(
+    distribution: dict, totalWeight: float = None, rng: random.Random = random
+) -> Union[float, int]:
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    rng defaults to the global random module, pass gamestate.rng for reproducible per-simulation draws."""
     assert isinstance(distribution, dict), "distribution must be of type: dict "
+    if totalWeight is None and isinstance(distribution, WeightedDistribution):
+        return distribution.draw(rng)
     if totalWeight is None:
         totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
+    roll = rng.uniform(0, totalWeight)
     cumulative = 0.0
     for value, weight in distribution.items():
         cumulative += weight
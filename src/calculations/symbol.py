@@ -2,6 +2,14 @@
 
 from typing import Dict
 
+# Fixed fields and commonly used attributes are stored in slots, any other attribute is kept in __dict__.
+# Slotted attributes which have not been assigned read as False, so attribute checks never miss a slot.
+SYMBOL_FIELDS = ("name", "special_functions", "special", "is_paying", "paytable")
+SYMBOL_ATTRIBUTES = ("wild", "scatter", "multiplier", "prize", "explode")
+_UNORDERED = frozenset(SYMBOL_FIELDS + ("attribute_order",))
+_MISSING = object()
+_set_slot = object.__setattr__
+
 
 class SymbolStorage:
     """Initial symbol generation from configuration file."""
@@ -9,24 +17,38 @@ class SymbolStorage:
     def __init__(self, config: object, all_symbols: list):
         self.config = config
         self.symbols: Dict[str, Symbol] = {}
+        self.prototype_states: Dict[str, dict] = {}
         for symbol in all_symbols:
-            self.symbols[symbol] = Symbol(self.config, symbol)
+            self.add_prototype(symbol)
+
+    def add_prototype(self, name: str) -> object:
+        """Build the prototype symbol once, subsequent symbols are cloned from its state."""
+        self.symbols[name] = Symbol(self.config, name)
+        self.prototype_states[name] = self.symbols[name].get_state()
+        return self.symbols[name]
 
     def create_symbol_state(self, symbol_name: str) -> object:
         """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        if symbol_name not in self.prototype_states:
+            return Symbol(self.config, symbol_name)
+        return Symbol.from_state(self.prototype_states[symbol_name])
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
         if name not in self.symbols:
-            self.symbols[name] = Symbol(self.config, name)
+            self.add_prototype(name)
         return self.symbols[name]
 
 
 class Symbol:
     """Create symbol from name (string) and assign relevant attributes and special functions."""
 
+    __slots__ = SYMBOL_FIELDS + SYMBOL_ATTRIBUTES + ("attribute_order", "__dict__")
+
     def __init__(self, config: object, name: str) -> None:
+        self.attribute_order = ()
+        for attr in SYMBOL_ATTRIBUTES:
+            _set_slot(self, attr, False)
         self.name = name
         self.special_functions = []
         self.special = False
@@ -41,9 +63,48 @@ class Symbol:
 
         self.assign_paying_bool(config)
 
+    @classmethod
+    def from_state(cls, state: dict) -> "Symbol":
+        """Create a symbol from the attributes of a prototype, without re-scanning the configuration."""
+        symbol = cls.__new__(cls)
+        for attr, value in state.items():
+            _set_slot(symbol, attr, value)
+        return symbol
+
+    def get_state(self) -> dict:
+        """All assigned fields and attributes, attributes in the order they were first assigned."""
+        state = {}
+        for attr in SYMBOL_FIELDS + SYMBOL_ATTRIBUTES:
+            value = getattr(self, attr, _MISSING)
+            if value is not _MISSING:
+                state[attr] = value
+        state["attribute_order"] = self.attribute_order
+        for attr in self.attribute_order:
+            value = getattr(self, attr, _MISSING)
+            if value is not _MISSING:
+                state[attr] = value
+        return state
+
+    def __setattr__(self, attr: str, value) -> None:
+        """Attributes outside of the fixed fields are added to attribute_order on their first assignment."""
+        if attr not in _UNORDERED and attr not in self.attribute_order:
+            _set_slot(self, "attribute_order", self.attribute_order + (attr,))
+        _set_slot(self, attr, value)
+
+    def __getstate__(self) -> dict:
+        return self.get_state()
+
+    def __setstate__(self, state: dict) -> None:
+        for attr, value in state.items():
+            _set_slot(self, attr, value)
+
+    def clone(self) -> "Symbol":
+        """Copy of this symbol, special functions are shared until a new one is registered."""
+        return Symbol.from_state(self.get_state())
+
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
-        self.special_functions.append(special_function)
+        self.special_functions = self.special_functions + [special_function]
 
     def apply_special_function(self) -> callable:
         """Apply registered symbol function."""
@@ -73,7 +134,8 @@ class Symbol:
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
         for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+            # bool values are the True/False singletons, any other assigned value counts as present
+            if getattr(self, arg, False) is not False:
                 return True
         return False
 
@@ -0,0 +1,56 @@
+"""Integer symbol-id encoding of boards and reelstrips, used by the array-based win evaluators and compact boards."""
+
+from array import array
+from typing import Dict, List
+import numpy as np
+
+EMPTY_CELL = -1
+
+
+class SymbolEncoder:
+    """Assign a fixed integer id to every valid symbol and precompute per-id property masks."""
+
+    def __init__(self, config: object, all_symbols: list):
+        self.names = sorted(all_symbols)
+        self.ids = {name: idx for idx, name in enumerate(self.names)}
+        self.num_symbols = len(self.names)
+        self.properties = {}
+        for prop, prop_symbols in config.special_symbols.items():
+            self.properties[prop] = np.array([name in prop_symbols for name in self.names], dtype=bool)
+        self.special = np.zeros(self.num_symbols, dtype=bool)
+        for mask in self.properties.values():
+            self.special |= mask
+        paying_symbols = {sym for _, sym in config.paytable}
+        self.paying = np.array([name in paying_symbols for name in self.names], dtype=bool)
+
+    def get_id(self, name: str) -> int:
+        """Integer id of a symbol name."""
+        return self.ids[name]
+
+    def get_name(self, sym_id: int) -> str:
+        """Symbol name of an integer id."""
+        return self.names[sym_id]
+
+    def get_mask(self, symbol_names) -> np.ndarray:
+        """Boolean array indexed by symbol id, True for the given names."""
+        return np.array([name in symbol_names for name in self.names], dtype=bool)
+
+    def encode_board(self, board: List[List[object]]) -> np.ndarray:
+        """Convert a board of Symbol objects into a (reels x max_rows) id grid, missing cells are EMPTY_CELL."""
+        max_rows = max(len(reel) for reel in board)
+        board_ids = np.full((len(board), max_rows), EMPTY_CELL, dtype=np.int16)
+        for reel, column in enumerate(board):
+            board_ids[reel, : len(column)] = [self.ids[sym.name] for sym in column]
+        return board_ids
+
+    def encode_reelstrips(self, reels: Dict[str, List[List[str]]]) -> Dict[str, List[array]]:
+        """Symbol ids of every reel in config.reels, keyed by reelstrip-id."""
+        return {
+            reelstrip_id: [array("h", [self.ids[name] for name in reel]) for reel in reelstrip]
+            for reelstrip_id, reelstrip in reels.items()
+        }
+
+    def decode_board(self, board_ids: np.ndarray) -> List[List[str]]:
+        """Symbol names of an id grid, ignoring empty cells."""
+        return [[self.names[sym_id] for sym_id in reel if sym_id != EMPTY_CELL] for reel in board_ids.tolist()]
+
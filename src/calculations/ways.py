@@ -1,7 +1,9 @@
 """Ways wins executables/calculations."""
 
 from collections import defaultdict
+import numpy as np
 from src.calculations.symbol import Symbol
+from src.calculations.symbol_encoder import EMPTY_CELL, SymbolEncoder
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -162,3 +164,93 @@ class Ways:
                     "gametype": gamestate.gametype,
                 }
             )
+
+
+class CompiledWays:
+    """
+    Ways evaluation for stacked integer symbol-id boards, used to estimate RTP without building books.
+    Reproduces the totalWin of Ways.get_ways_data() for each board, including wild substitution and the
+    'symbol', 'board' and 'global' multiplier strategies.
+    """
+
+    def __init__(self, config: Config, symbol_encoder: SymbolEncoder, wild_key: str = "wild"):
+        self.config = config
+        self.encoder = symbol_encoder
+        self.num_symbols = symbol_encoder.num_symbols
+        self.wild_mask = symbol_encoder.get_mask(config.special_symbols[wild_key])
+        self.paytable = np.zeros((self.num_symbols, config.num_reels + 1))
+        for (kind, name), pay in config.paytable.items():
+            if kind <= config.num_reels and name in symbol_encoder.ids:
+                self.paytable[symbol_encoder.ids[name], kind] = pay
+
+    @staticmethod
+    def get_multiplier_array(board: list[list[Symbol]], multiplier_key: str = "multiplier") -> np.ndarray:
+        """Symbol multiplier values of a board in (reels x max_rows) layout, 1 where no multiplier is present."""
+        multipliers = np.ones((len(board), max(len(reel) for reel in board)))
+        for reel, _ in enumerate(board):
+            for row, sym in enumerate(board[reel]):
+                if sym.check_attribute(multiplier_key):
+                    multipliers[reel, row] = sym.get_attribute(multiplier_key)
+        return multipliers
+
+    def get_reel_counts(self, board_ids: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sum of weights per (board, symbol, reel), empty cells are ignored."""
+        num_boards, num_reels, _ = board_ids.shape
+        valid = board_ids != EMPTY_CELL
+        index = (np.arange(num_boards)[:, None, None] * self.num_symbols + board_ids) * num_reels + np.arange(
+            num_reels
+        )[None, :, None]
+        counts = np.bincount(
+            index[valid], weights=weights[valid], minlength=num_boards * self.num_symbols * num_reels
+        )
+        return counts.reshape(num_boards, self.num_symbols, num_reels)
+
+    def evaluate_batch(
+        self,
+        board_ids: np.ndarray,
+        multipliers: np.ndarray = None,
+        multiplier_strategy: str = "symbol",
+        global_multiplier: int = 1,
+    ) -> np.ndarray:
+        """
+        Total ways win for boards with shape (boards, reels, rows). Symbol multiplier values can be given in an
+        array of the same shape (1 where there is no multiplier). Returns an array of shape (boards,).
+        """
+        assert multiplier_strategy in ["symbol", "board", "global"]
+        board_ids = np.asarray(board_ids)
+        num_boards, num_reels, num_rows = board_ids.shape
+        if multipliers is None:
+            multipliers = np.ones(board_ids.shape)
+        is_wild = self.wild_mask[board_ids] & (board_ids != EMPTY_CELL)
+        ones = np.ones(board_ids.shape)
+
+        sym_present = self.get_reel_counts(board_ids, ones) > 0
+        wild_present = is_wild.any(axis=2)
+        present = sym_present | wild_present[:, None, :]
+        kind = np.where(present.all(axis=2), num_reels, present.argmin(axis=2))
+        in_kind = np.arange(num_reels)[None, None, :] < kind[..., None]
+        on_first_reel = sym_present[:, :, 0]
+
+        cell_weights = multipliers if multiplier_strategy == "symbol" else ones
+        reel_counts = self.get_reel_counts(board_ids, cell_weights) + (is_wild * cell_weights).sum(axis=2)[:, None, :]
+        ways = np.where(in_kind, reel_counts, 1).prod(axis=2)
+        win = np.round(self.paytable[np.arange(self.num_symbols)[None, :], kind] * ways, 2)
+        win = np.where(on_first_reel, win, 0.0)
+
+        if multiplier_strategy == "global":
+            win = np.round(win * global_multiplier, 2)
+        elif multiplier_strategy == "board":
+            # board multipliers accumulate over all evaluated symbols, in order of their first row on reel 0
+            board_mults = multipliers * (multipliers > 1)
+            reel_mults = self.get_reel_counts(board_ids, board_mults) + (is_wild * board_mults).sum(axis=2)[:, None, :]
+            symbol_mults = np.where(in_kind & on_first_reel[..., None], reel_mults, 0).sum(axis=2)
+            first_row = np.full((num_boards, self.num_symbols), num_rows)
+            reel_ids = board_ids[:, 0, :]
+            for row in range(num_rows - 1, -1, -1):
+                valid = reel_ids[:, row] != EMPTY_CELL
+                first_row[np.flatnonzero(valid), reel_ids[valid, row]] = row
+            evaluated_before = first_row[:, None, :] <= first_row[:, :, None]
+            cumulative_mults = (evaluated_before * symbol_mults[:, None, :]).sum(axis=2)
+            win = np.round(win * np.maximum(cumulative_mults, 1), 2)
+
+        return win.sum(axis=1)
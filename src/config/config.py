@@ -18,6 +18,16 @@ class Config:
         self.provider_number = 1
         self.game_name = "sample_lines"
         self.output_regular_json = True  # if True, outputs .json if compression = False. If False, outputs .jsonl
+        self.rng_seed = 0  # master seed, each simulation draws from its own stream derived from (rng_seed, sim)
+        self.zstd_level = 3  # compression level used for .jsonl.zst books
+        self.zstd_threads = 0  # zstd worker threads per simulation process (0: single-threaded, -1: all cores)
+        self.zstd_window_log = 0  # log2 match window (0: level default, above 27 readers must raise max_window_size)
+        self.zstd_long_distance = False  # long-distance matching, finds repeated boards/events across many books
+        self.zstd_dictionary = False  # experimental, compress the books of a mode with a dictionary trained on batch 1
+        self.zstd_dict_size = 112640  # maximum trained dictionary size in bytes
+        self.zstd_frame_books = 100  # books per zstd frame, indexed for random access by BookReader (0: no index)
+        self.book_serializer = "auto"  # "auto", "orjson", "msgspec" or "json", fast encoders are used for compact books
+        self.compact_books = False  # if True, books are written without spaces after "," and ":" (and as UTF-8)
         if self.game_id != "0_0_sample":
             self.construct_paths()
 
@@ -40,6 +50,10 @@ class Config:
         self.freegame_type = "freegame"
 
         self.include_padding = True
+        self.encoded_boards = False  # if True, reveal boards are stored in books as pre-encoded JSON fragments
+        # if True, boards are drawn as symbol-id grids and only special symbols get their own Symbol object,
+        # other board positions share one Symbol per name. Only for games which do not modify board symbols (no tumbles)
+        self.compact_board = False
 
         # Define the number of scatter-symbols required to award free-spins
         self.freespin_triggers = {}
@@ -2,6 +2,7 @@
 
 from typing import Union
 import json
+from src.calculations.statistics import compile_weight_tables
 
 
 class Distribution:
@@ -38,7 +39,8 @@ class Distribution:
             if rk not in condition_keys:
                 conditions[rk] = self._default_distribution_conditions[rk]
 
-        self._conditions = conditions
+        # Weight tables (reel_weights, mult_values, scatter_triggers, ...) are compiled once for O(1) sampling
+        self._conditions = compile_weight_tables(conditions)
 
     def get_criteria(self):
         """Return distribution criteria value."""
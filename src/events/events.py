@@ -1,43 +1,124 @@
 """Defines reusable events"""
 
-from copy import deepcopy
+from functools import wraps
 from src.events.event_constants import EventConstants
+from src.write_data.book_serializer import JSONFragment, get_book_serializer
+
+
+def book_event(event_function: callable) -> callable:
+    """Skip event construction when books are not being written (create_books(books=False))."""
+
+    @wraps(event_function)
+    def wrapper(gamestate, *args, **kwargs):
+        if not getattr(gamestate, "write_books", True):
+            return None
+        return event_function(gamestate, *args, **kwargs)
+
+    return wrapper
+
+
+def to_cents(amount: float, wincap: float) -> int:
+    """Win amount capped at the wincap, as integer cents of the bet."""
+    return int(round(min(amount, wincap) * 100, 0))
+
+
+def offset_positions(positions: list, row_offset: int) -> list:
+    """New reel/row position records with rows shifted by row_offset (1 when the board includes padding symbols)."""
+    return [{"reel": pos["reel"], "row": pos["row"] + row_offset} for pos in positions]
 
 
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
-    for key, val in attrs.items():
-        if key in special_attributes and symbol.get_attribute(key) != False:
-            print_sym[key] = val
+    attribute_order = getattr(symbol, "attribute_order", None)
+    for key in vars(symbol) if attribute_order is None else attribute_order:
+        if key in special_attributes:
+            val = getattr(symbol, key)
+            if val != False:
+                print_sym[key] = val
     return print_sym
 
 
+class BoardEncoder:
+    """
+    Cached JSON forms of board symbols. Symbols which are not special and have no special functions always encode
+    to their prototype, so one shared record (and its JSON string) is kept per name. Stateful symbols are encoded
+    from their current attributes on every call. Shared records must not be modified by events.
+    """
+
+    def __init__(self, gamestate):
+        self.special_attributes = list(gamestate.config.special_symbols.keys())
+        self.stateful = set(gamestate.special_symbol_functions)
+        for names in gamestate.config.special_symbols.values():
+            self.stateful.update(names)
+        self.symbol_storage = gamestate.symbol_storage
+        self.serializer = get_book_serializer(
+            getattr(gamestate.config, "book_serializer", "auto"), getattr(gamestate.config, "compact_books", False)
+        )
+        self.records = {}
+        self.fragments = {}
+
+    def add_record(self, name: str) -> dict:
+        """Encode the prototype of a symbol name."""
+        self.records[name] = json_ready_sym(self.symbol_storage.get_symbol(name), self.special_attributes)
+        self.fragments[name] = self.serializer.dumps(self.records[name])
+        return self.records[name]
+
+    def encode_symbol(self, symbol: object) -> dict:
+        """json_ready_sym() equivalent, shared record for non-stateful symbols."""
+        if symbol.name in self.stateful:
+            return json_ready_sym(symbol, self.special_attributes)
+        return self.records.get(symbol.name) or self.add_record(symbol.name)
+
+    def encode_board(self, gamestate) -> list:
+        """JSON-ready board for the reveal event, including padding symbols."""
+        board = [[self.encode_symbol(symbol) for symbol in column] for column in gamestate.board]
+        if gamestate.config.include_padding:
+            for reel, column in enumerate(board):
+                column.insert(0, self.encode_symbol(gamestate.top_symbols[reel]))
+                column.append(self.encode_symbol(gamestate.bottom_symbols[reel]))
+        return board
+
+    def encode_board_fragment(self, gamestate) -> JSONFragment:
+        """Pre-encoded JSON of encode_board(), in the format of the book serializer."""
+        reels = []
+        for column in self.encode_board(gamestate):
+            cells = [
+                self.fragments[record["name"]]
+                if record is self.records.get(record["name"])
+                else self.serializer.dumps(record)
+                for record in column
+            ]
+            reels.append("[" + self.serializer.item_separator.join(cells) + "]")
+        return JSONFragment("[" + self.serializer.item_separator.join(reels) + "]")
+
+
+def get_board_encoder(gamestate) -> BoardEncoder:
+    """BoardEncoder of a gamestate, created on first use (after special symbol functions are assigned)."""
+    encoder = getattr(gamestate, "board_encoder", None)
+    if encoder is None:
+        encoder = BoardEncoder(gamestate)
+        gamestate.board_encoder = encoder
+    return encoder
+
+
+@book_event
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
-    board_client = []
-    special_attributes = list(gamestate.config.special_symbols.keys())
-    for reel, _ in enumerate(gamestate.board):
-        board_client.append([])
-        for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
-
-    if gamestate.config.include_padding:
-        for reel, _ in enumerate(board_client):
-            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[
-                reel
-            ]
-            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+    encoder = get_board_encoder(gamestate)
+    if getattr(gamestate.config, "encoded_boards", False):
+        board_client = encoder.encode_board_fragment(gamestate)
+    else:
+        board_client = encoder.encode_board(gamestate)
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
@@ -58,25 +139,30 @@ def fs_trigger_event(
         for pos in scatter_positions:
             pos["row"] += 1
 
+    assert gamestate.tot_fs > 0, "total freegame (gamestate.tot_fs) must be >0"
+    # scatter positions are still updated above, since games may rely on the shifted rows
+    if not getattr(gamestate, "write_books", True):
+        return
+
     if basegame_trigger:
         event = {
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINTRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": offset_positions(scatter_positions, 0),
         }
     elif freegame_trigger:
         event = {
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINRETRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": offset_positions(scatter_positions, 0),
         }
 
-    assert gamestate.tot_fs > 0, "total freegame (gamestate.tot_fs) must be >0"
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -94,95 +180,82 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@book_event
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.SET_TOTAL_WIN.value,
-        "amount": int(
-            round(
-                min(gamestate.win_manager.running_bet_win, gamestate.config.wincap) * 100,
-                0,
-            )
-        ),
+        "amount": to_cents(gamestate.win_manager.running_bet_win, gamestate.config.wincap),
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.SET_TUMBLE_WIN.value,
-        "amount": int(round(min(gamestate.tumble_win, gamestate.config.wincap) * 100)),
+        "amount": to_cents(gamestate.tumble_win, gamestate.config.wincap),
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.WINCAP.value,
-        "amount": int(
-            round(
-                min(gamestate.win_manager.running_bet_win, gamestate.config.wincap) * 100,
-                0,
-            )
-        ),
+        "amount": to_cents(gamestate.win_manager.running_bet_win, gamestate.config.wincap),
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
-    win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
-    for idx, w in enumerate(win_data_copy["wins"]):
+    wincap = gamestate.config.wincap
+    wins = []
+    for win in gamestate.win_data["wins"]:
+        win_record = dict(win)
+        win_record["win"] = to_cents(win["win"], wincap)
         if include_padding_index:
-            new_positions = []
-            for p in w["positions"]:
-                new_positions.append({"reel": p["reel"], "row": p["row"] + 1})
+            win_record["positions"] = offset_positions(win["positions"], 1)
         else:
-            new_positions = w["positions"]
-
-        win_data_copy["wins"][idx]["win"] = int(
-            round(min(win_data_copy["wins"][idx]["win"], gamestate.config.wincap) * 100, 0)
-        )
-        win_data_copy["wins"][idx]["positions"] = new_positions
-        if "meta" in win_data_copy["wins"][idx]:
-            win_data_copy["wins"][idx]["meta"]["winWithoutMult"] = int(
-                int(
-                    min(
-                        win_data_copy["wins"][idx]["meta"]["winWithoutMult"] * 100,
-                        gamestate.config.wincap * 100,
-                    ),
-                )
-            )
-            if "overlay" in win_data_copy["wins"][idx]["meta"] and include_padding_index:
-                win_data_copy["wins"][idx]["meta"]["overlay"]["row"] += 1
+            win_record["positions"] = [dict(pos) for pos in win["positions"]]
+        if "meta" in win:
+            meta = dict(win["meta"])
+            meta["winWithoutMult"] = int(min(meta["winWithoutMult"] * 100, wincap * 100))
+            if "overlay" in meta and include_padding_index:
+                meta["overlay"] = {**meta["overlay"], "row": meta["overlay"]["row"] + 1}
+            win_record["meta"] = meta
+        wins.append(win_record)
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.WIN_DATA.value,
-        "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
-        "wins": win_data_copy["wins"],
+        "totalWin": to_cents(gamestate.win_data["totalWin"], wincap),
+        "wins": wins,
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.UPDATE_TUMBLE_WIN.value,
-        "amount": int(round(min(gamestate.win_manager.spin_win, gamestate.config.wincap) * 100, 0)),
+        "amount": to_cents(gamestate.win_manager.spin_win, gamestate.config.wincap),
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -194,6 +267,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -205,17 +279,19 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@book_event
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.FINAL_WIN.value,
-        "amount": int(round(min(gamestate.final_win, gamestate.config.wincap) * 100, 0)),
+        "amount": to_cents(gamestate.final_win, gamestate.config.wincap),
     }
     
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -227,24 +303,20 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
-    special_attributes = list(gamestate.config.special_symbols.keys())
-
+    encoder = get_board_encoder(gamestate)
+    row_offset = 1 if gamestate.config.include_padding else 0
     exploding = []
     for win in gamestate.win_data["wins"]:
-        for pos in win["positions"]:
-            if gamestate.config.include_padding:
-                exploding.append({"reel": pos["reel"], "row": pos["row"] + 1})
-            else:
-                exploding.append({"reel": pos["reel"], "row": pos["row"]})
-
-    exploding = sorted(exploding, key=lambda x: x["reel"])
+        exploding += offset_positions(win["positions"], row_offset)
+    exploding.sort(key=lambda x: x["reel"])
 
     new_symbols = [[] for _ in range(gamestate.config.num_reels)]
     for r, _ in enumerate(gamestate.new_symbols_from_tumble):
         if len(gamestate.new_symbols_from_tumble[r]) > 0:
-            new_symbols[r] = [json_ready_sym(s, special_attributes) for s in gamestate.new_symbols_from_tumble[r]]
+            new_symbols[r] = [encoder.encode_symbol(s) for s in gamestate.new_symbols_from_tumble[r]]
 
     event = {
         "index": len(gamestate.book.events),
@@ -255,6 +327,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
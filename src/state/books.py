@@ -1,7 +1,5 @@
 "Handles independent simulation events and details."
 
-from copy import deepcopy
-
 
 class Book:
     "Stores simulation information."
@@ -16,8 +14,9 @@ class Book:
         self.freegame_wins = 0.0
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        """Append event to book. Events are stored without copying, so they must be new records which do not
+        reference mutable game state (see src/events/events.py)."""
+        self.events.append(event)
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
@@ -35,3 +34,13 @@ class Book:
             "freeGameWins": self.freegame_wins,
         }
         return json_book
+
+    def to_summary(self):
+        "Return the book payout information without events, used when only lookup tables are written."
+        return {
+            "id": self.id,
+            "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
+            "criteria": self.criteria,
+            "baseGameWins": self.basegame_wins,
+            "freeGameWins": self.freegame_wins,
+        }
@@ -1,13 +1,24 @@
+import os
 import time
 import random
-from multiprocessing import Process, Manager
+import pickle
+from multiprocessing import Pool
 import cProfile
 from warnings import warn
 import shutil
 import asyncio
 from typing import Dict
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.write_data import (
+    output_lookup_and_force_files,
+    print_compression_summary,
+    reset_book_dictionary,
+    train_mode_dictionary,
+    write_library_events,
+)
+
+# Serialised gamestate held by each long-lived pool worker, assigned once by init_worker()
+_worker_gamestate = None
 
 
 def create_books(
@@ -18,8 +29,17 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    scheduler: str = "static",
+    books: bool = True,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """Main run-function for simulating game outcomes and outputting all files.
+
+    scheduler="static" runs each batch on all threads and waits for the slowest thread before starting the next.
+    scheduler="dynamic" hands out batch_size sized chunks of sim ids from the shared pool queue, so idle workers
+    pick up the next chunk until the whole mode is finished. Book ids and output order are identical for both.
+    books=False runs an RTP-only simulation: events are not constructed and no book files are written, only lookup
+    tables, pay splits and force records are output.
+    """
     # print(f"DEBUG: create_books START - num_sim_args: {num_sim_args}")
     # print(f"DEBUG: create_books - gamestate: {gamestate}")
     # print(f"DEBUG: create_books - config: {config}")
@@ -37,8 +57,42 @@ def create_books(
     if profiling and threads > 1:
         raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
 
+    assert scheduler in ["static", "dynamic"], "scheduler must be either 'static' or 'dynamic'"
+
     startTime = time.time()
     print("\nCreating books...")
+    pool = None
+    if threads > 1:
+        pool = Pool(processes=threads, initializer=init_worker, initargs=(gamestate,))
+        print("Started worker pool with", threads, "processes.")
+    try:
+        mode_stats = run_all_betmodes(
+            gamestate, config, num_sim_args, batch_size, threads, compress, profiling, pool, scheduler, books
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    shutil.rmtree(gamestate.output_files.temp_path)
+    if books:
+        print_compression_summary(mode_stats)
+    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+
+
+def run_all_betmodes(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    profiling: bool,
+    pool: object = None,
+    scheduler: str = "static",
+    books: bool = True,
+) -> Dict[str, dict]:
+    """Simulate and combine output files for each requested betmode, returns the book output stats of each mode."""
+    mode_stats = {}
     # print(f"DEBUG: create_books - About to start loop with num_sim_args: {num_sim_args}")
     for betmode_name in num_sim_args:
         # print(f"DEBUG: create_books - Processing betmode: {betmode_name}")
@@ -56,7 +110,8 @@ def create_books(
             #  gamestate.reset_seed(0)
             
             # print(f"DEBUG: create_books - About to call run_multi_process_sims for {betmode_name}")
-            run_multi_process_sims(
+            mode_start = time.time()
+            book_stats = run_multi_process_sims(
                 threads,
                 batch_size,
                 config.game_id,
@@ -66,6 +121,9 @@ def create_books(
                 compress=compress,
                 write_event_list=config.write_event_list,
                 profiling=profiling,
+                pool=pool,
+                scheduler=scheduler,
+                books=books,
             )
             output_lookup_and_force_files(
                 threads,
@@ -75,12 +133,25 @@ def create_books(
                 gamestate,
                 num_sims=num_sim_args[betmode_name],
                 compress=compress,
+                books=books,
+                pool=pool,
             )  # , write_event_list=config.write_event_list)
-    shutil.rmtree(gamestate.output_files.temp_path)
-    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+            if books:
+                book_file = gamestate.output_files.get_final_book_name(betmode_name, compress)
+                book_stats["file_bytes"] = os.path.getsize(book_file)
+                book_stats["elapsed"] = time.time() - mode_start
+                mode_stats[betmode_name] = book_stats
+    return mode_stats
+
+
+def get_criteria_rng(gamestate: object, betmode_name: str) -> random.Random:
+    """Seeded stream used for criteria allocation, derived from the config master seed and betmode name."""
+    return random.Random(f"{gamestate.config.rng_seed}:{betmode_name}")
 
 
-def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
+def get_sim_splits(
+    gamestate: object, num_sims: int, betmode_name: str, rng: random.Random = random
+) -> Dict[str, int]:
     """Ensure assignment of criteria to all simulations numbers."""
     betmode_distributions = gamestate.get_betmode(betmode_name).get_distributions()
     num_sims_criteria = {d._criteria: max(int(num_sims * d._quota), 1) for d in betmode_distributions}
@@ -88,9 +159,8 @@ def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[
     reduce_sims = total_sims > num_sims
     listedCriteria = [d._criteria for d in betmode_distributions]
     criteria_weights = [d._quota for d in betmode_distributions]
-    # random.seed(0)
     while sum(num_sims_criteria.values()) != num_sims:
-        c = random.choices(listedCriteria, criteria_weights)[0]
+        c = rng.choices(listedCriteria, criteria_weights)[0]
         if reduce_sims and num_sims_criteria[c] > 1:
             num_sims_criteria[c] -= 1
         elif not reduce_sims:
@@ -99,13 +169,89 @@ def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[
     return num_sims_criteria
 
 
-def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[int, str]:
+def assign_sim_criteria(
+    num_sims_criteria: Dict[str, int], sims: int, rng: random.Random = random
+) -> Dict[int, str]:
     """Assign criteria randomly to simulations based on quota defined in config."""
     simAllocation = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
-    random.shuffle(simAllocation)
+    rng.shuffle(simAllocation)
     return {i: simAllocation[i] for i in range(min(sims, len(simAllocation)))}
 
 
+def replay_book(gamestate: object, betmode_name: str, num_sims: int, book_id: int) -> dict:
+    """Regenerate a single book from a create_books run without re-running the batch.
+    num_sims must match the number of simulations originally run in the mode, so that the criteria allocation
+    is reconstructed identically."""
+    criteria_rng = get_criteria_rng(gamestate, betmode_name)
+    num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode_name, rng=criteria_rng)
+    sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims, rng=criteria_rng)
+    sim = book_id - 1
+    return gamestate.replay_sim(betmode_name, sim, sim_allocation[sim])
+
+
+def init_worker(gamestate: object) -> None:
+    """Store the initial gamestate once per pool worker, each batch the worker receives starts from this state."""
+    global _worker_gamestate
+    _worker_gamestate = pickle.dumps(gamestate)
+
+
+def get_batch_args(
+    betmode: str,
+    sim_allocation: Dict[int, str],
+    threads: int,
+    num_repeats: int,
+    sims_per_thread: int,
+    thread: int,
+    repeat: int,
+    compress: bool,
+    write_event_list: bool,
+    books: bool = True,
+) -> tuple:
+    """Work item for a single (thread, repeat) sim-range, only the criteria within the range are sent."""
+    first_sim = thread * sims_per_thread + (threads * sims_per_thread) * repeat
+    batch_criteria = {sim: sim_allocation[sim] for sim in range(first_sim, first_sim + sims_per_thread)}
+    return (
+        betmode,
+        batch_criteria,
+        threads,
+        num_repeats,
+        sims_per_thread,
+        thread,
+        repeat,
+        compress,
+        write_event_list,
+        books,
+    )
+
+
+def run_worker_batch(sim_args: tuple) -> tuple:
+    """Run a single (betmode, sim-range) work item on a fresh copy of the worker gamestate, return the updated
+    betmode configs, book output stats and event example books. Batches are handed to whichever worker is free, so game state left over
+    from a previous batch (i.e values not cleared by reset_book()) must not carry over, otherwise results depend on
+    scheduling."""
+    betmode_copy_list = []
+    gamestate = pickle.loads(_worker_gamestate)
+    gamestate.run_sims(betmode_copy_list, *sim_args)
+    return betmode_copy_list, gamestate.book_stats, gamestate.event_examples
+
+
+def add_book_stats(total_stats: dict, batch_stats: dict) -> None:
+    """Accumulate the BookWriter stats of a single batch."""
+    for key, val in batch_stats.items():
+        total_stats[key] = total_stats.get(key, 0) + val
+
+
+def add_event_examples(event_examples: list, batch_examples: list) -> None:
+    """Keep the batch books containing an event type not seen yet. Batches must be added in sim-id order, so the
+    examples written to event_config do not depend on which worker finishes first."""
+    seen_types = {instance["type"] for book in event_examples for instance in book["events"]}
+    for book in batch_examples:
+        book_types = {instance["type"] for instance in book["events"]}
+        if not book_types <= seen_types:
+            event_examples.append(book)
+            seen_types |= book_types
+
+
 async def profile_and_visualize(
     game_id,
     gamestate,
@@ -118,11 +264,12 @@ async def profile_and_visualize(
     repeat,
     compress,
     write_event_list,
+    books=True,
 ):
     """Create flame-graph, automatically opens output on localhost."""
     output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
     cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list)",
+        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, books)",
         globals(),
         locals(),
         output_string,
@@ -140,18 +287,78 @@ def run_multi_process_sims(
     compress: bool = True,
     write_event_list: bool = False,
     profiling: bool = False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
+    pool: object = None,
+    scheduler: str = "static",
+    books: bool = True,
+) -> dict:
+    """Distribute all game-mode simulations across the worker pool, per batch or as dynamically queued chunks.
+    Returns the book output stats summed over all batches."""
     print("\nCreating books for", game_id, "in", betmode)
     num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
     sims_per_thread = int(num_sims / threads / num_repeats)
-    num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
-    sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims)
+    criteria_rng = get_criteria_rng(gamestate, betmode)
+    num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode, rng=criteria_rng)
+    sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims, rng=criteria_rng)
+    if compress and books:
+        reset_book_dictionary(gamestate, betmode)
+    train_dictionary = compress and books and gamestate.config.zstd_dictionary
+    if pool is not None and scheduler == "dynamic":
+        book_stats, event_examples = run_dynamic_sims(
+            pool,
+            threads,
+            betmode,
+            gamestate,
+            sim_allocation,
+            num_repeats,
+            sims_per_thread,
+            compress=compress,
+            write_event_list=write_event_list,
+            books=books,
+            train_dictionary=train_dictionary,
+        )
+    else:
+        book_stats, event_examples = run_static_sims(
+            threads,
+            game_id,
+            betmode,
+            gamestate,
+            sim_allocation,
+            num_repeats,
+            sims_per_thread,
+            compress=compress,
+            write_event_list=write_event_list,
+            profiling=profiling,
+            pool=pool,
+            books=books,
+            train_dictionary=train_dictionary,
+        )
+    if write_event_list and books:
+        write_library_events(gamestate, event_examples, betmode)
+    return book_stats
+
+
+def run_static_sims(
+    threads: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    sim_allocation: Dict[int, str],
+    num_repeats: int,
+    sims_per_thread: int,
+    compress: bool = True,
+    write_event_list: bool = False,
+    profiling: bool = False,
+    pool: object = None,
+    books: bool = True,
+    train_dictionary: bool = False,
+) -> tuple:
+    """Run each batch on all threads, waiting for every thread before the next batch is started.
+    Returns the summed book output stats and the event example books."""
+    book_stats = {}
+    event_examples = []
     for repeat in range(num_repeats):
         print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
+        all_betmode_configs = []
         if profiling:
             asyncio.run(
                 profile_and_visualize(
@@ -166,8 +373,11 @@ def run_multi_process_sims(
                     repeat=repeat,
                     compress=compress,
                     write_event_list=write_event_list,
+                    books=books,
                 )
             )
+            add_book_stats(book_stats, gamestate.book_stats)
+            add_event_examples(event_examples, gamestate.event_examples)
         elif threads == 1:
             gamestate.run_sims(
                 betmode_copy_list=all_betmode_configs,
@@ -180,30 +390,91 @@ def run_multi_process_sims(
                 repeat_count=repeat,
                 compress=compress,
                 write_event_list=write_event_list,
+                write_books=books,
             )
+            add_book_stats(book_stats, gamestate.book_stats)
+            add_event_examples(event_examples, gamestate.event_examples)
         else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        sim_allocation,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                    ),
+            batch_args = [
+                get_batch_args(
+                    betmode,
+                    sim_allocation,
+                    threads,
+                    num_repeats,
+                    sims_per_thread,
+                    thread,
+                    repeat,
+                    compress,
+                    write_event_list,
+                    books,
                 )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
+                for thread in range(threads)
+            ]
+            for betmode_configs, batch_stats, batch_examples in pool.map(run_worker_batch, batch_args, chunksize=1):
+                all_betmode_configs.extend(betmode_configs)
+                add_book_stats(book_stats, batch_stats)
+                add_event_examples(event_examples, batch_examples)
+            print("Finished batch", repeat + 1)
             gamestate.combine(all_betmode_configs, betmode)
             gamestate.get_betmode(betmode).lock_force_keys()
+        if train_dictionary and repeat == 0:
+            train_mode_dictionary(gamestate, betmode, threads)
+    return book_stats, event_examples
+
+
+def run_dynamic_sims(
+    pool: object,
+    threads: int,
+    betmode: str,
+    gamestate: object,
+    sim_allocation: Dict[int, str],
+    num_repeats: int,
+    sims_per_thread: int,
+    compress: bool = True,
+    write_event_list: bool = False,
+    books: bool = True,
+    train_dictionary: bool = False,
+) -> tuple:
+    """Queue every sim-range chunk of a mode at once, idle workers pull the next chunk in sim-id order.
+    Chunk i keeps the (thread, repeat) file naming of the static layout so outputs are merged in the same order.
+    With train_dictionary the first batch of chunks is run on its own and used to train the book dictionary.
+    Chunk results are combined as they arrive, returns the summed book output stats and the event example books."""
+    num_chunks = threads * num_repeats
+    print("Queued", num_chunks, "chunks of", sims_per_thread, "simulations")
+    book_stats = {}
+    event_examples = []
+
+    def add_chunk_result(result):
+        betmode_configs, batch_stats, batch_examples = result
+        gamestate.combine(betmode_configs, betmode)
+        add_book_stats(book_stats, batch_stats)
+        add_event_examples(event_examples, batch_examples)
+
+    def get_chunk_args(chunks):
+        return (
+            get_batch_args(
+                betmode,
+                sim_allocation,
+                threads,
+                num_repeats,
+                sims_per_thread,
+                chunk % threads,
+                chunk // threads,
+                compress,
+                write_event_list,
+                books,
+            )
+            for chunk in chunks
+        )
+
+    first_chunk = 0
+    if train_dictionary:
+        for result in pool.map(run_worker_batch, get_chunk_args(range(threads)), chunksize=1):
+            add_chunk_result(result)
+        train_mode_dictionary(gamestate, betmode, threads)
+        first_chunk = threads
+    for result in pool.imap(run_worker_batch, get_chunk_args(range(first_chunk, num_chunks)), chunksize=1):
+        add_chunk_result(result)
+    print("Finished all chunks.")
+    gamestate.get_betmode(betmode).lock_force_keys()
+    return book_stats, event_examples
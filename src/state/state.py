@@ -1,4 +1,5 @@
 from copy import copy
+from array import array
 from abc import ABC, abstractmethod
 from warnings import warn
 import random
@@ -6,15 +7,12 @@ import random
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
+from src.calculations.symbol_encoder import SymbolEncoder
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
-from src.write_data.write_data import (
-    print_recorded_wins,
-    make_lookup_tables,
-    write_json,
-    make_lookup_pay_split,
-    write_library_events,
-)
+from src.write_data.write_data import print_recorded_wins
+from src.write_data.book_serializer import get_book_serializer
+from src.write_data.book_writer import BookWriter, load_dictionary
 
 
 class GeneralGameState(ABC):
@@ -26,10 +24,14 @@ class GeneralGameState(ABC):
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
         self.recorded_events = {}
+        self.description_keys = {}
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
         self.assign_special_sym_function()
+        self.compact_symbols = None
+        if self.config.compact_board:
+            self.create_compact_symbol_map()
         self.sim = 0
         self.criteria = ""
         self.book = Book(self.sim, self.criteria)
@@ -39,6 +41,10 @@ class GeneralGameState(ABC):
             "totalWin": 0,
             "wins": [],
         }
+        self.rng = random.Random()
+        self.write_books = True
+        self.book_writer = None
+        self.book_stats = {}
         self.reset_seed()
         self.reset_book()
         self.reset_fs_spin()
@@ -55,6 +61,17 @@ class GeneralGameState(ABC):
 
         all_symbols_list = list(all_symbols_list)
         self.symbol_storage = SymbolStorage(self.config, all_symbols_list)
+        self.symbol_encoder = SymbolEncoder(self.config, all_symbols_list)
+
+    def create_compact_symbol_map(self) -> None:
+        """Encode reelstrips as symbol ids and collect the shared Symbols placed on compact boards.
+        Special symbols and symbols with special functions are None, these are created for every board position."""
+        self.encoded_reels = self.symbol_encoder.encode_reelstrips(self.config.reels)
+        self.compact_symbols = []
+        for name in self.symbol_encoder.names:
+            symbol = self.symbol_storage.symbols[name]
+            stateful = symbol.special or name in self.special_symbol_functions
+            self.compact_symbols.append(None if stateful else symbol)
 
     @abstractmethod
     def assign_special_sym_function(self):
@@ -65,6 +82,7 @@ class GeneralGameState(ABC):
         """Reset global simulation variables."""
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
+        self.board_ids = None
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim + 1
@@ -90,8 +108,9 @@ class GeneralGameState(ABC):
         self.base_spins_count = 0   # Кількість базових спінів
 
     def reset_seed(self, sim: int = 0) -> None:
-        """Reset rng seed to simulation number for reproducibility."""
-        # random.seed(sim + 1)
+        """Reset rng seed to simulation number for reproducibility.
+        The stream depends only on (config.rng_seed, sim), so results do not change with thread/batch layout."""
+        self.rng.seed(f"{self.config.rng_seed}:{sim}")
         self.sim = sim
         self.repeat_count = 0
 
@@ -160,11 +179,20 @@ class GeneralGameState(ABC):
         Freespin triggers are most commonly used, i.e {"kind": X, "symbol": "S", "gametype": "basegame"}
         It is recommended to otherwise record rare events with several keys in order to reduce the overall file-size containing many duplicate ids
         """
-        dstr = {}
-        for k, v in description.items():
-            dstr[str(k)] = str(v)
-        self.temp_wins.append(dstr)
-        self.temp_wins.append(self.book_id)
+        self.temp_wins.append(self.get_description_key(description))
+
+    def get_description_key(self, description: dict) -> tuple:
+        """Interned, sorted (str(key), str(value)) tuple of a recorded description, computed once per description.
+        Value types are part of the lookup so that i.e 3, 3.0 and True do not share a key."""
+        try:
+            raw_key = tuple((k, v, type(v)) for k, v in description.items())
+            return self.description_keys[raw_key]
+        except KeyError:
+            description_key = tuple(sorted((str(k), str(v)) for k, v in description.items()))
+            self.description_keys[raw_key] = description_key
+            return description_key
+        except TypeError:
+            return tuple(sorted((str(k), str(v)) for k, v in description.items()))
 
     def check_force_keys(self, description) -> None:
         """Check and append unique force-key parameters."""
@@ -186,23 +214,22 @@ class GeneralGameState(ABC):
 
     def imprint_wins(self) -> None:
         """Record all events to library if criteria conditions are satisfied."""
-        for temp_win_index in range(int(len(self.temp_wins) / 2)):
-            description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
-            book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            elif description not in self.recorded_events:
+        book_id = self.book_id
+        for description in self.temp_wins:
+            book_ids = self.recorded_events.get(description)
+            if book_ids is None:
                 self.check_force_keys(description)
-                self.recorded_events[description] = {
-                    "timesTriggered": 1,
-                    "bookIds": [book_id],
-                }
+                self.recorded_events[description] = array("I", [book_id])
+            elif book_ids[-1] != book_id:
+                # book ids increase within a run, so a repeated id can only be the last one recorded
+                book_ids.append(book_id)
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
-        
+        book = self.book.to_json() if self.write_books else self.book.to_summary()
+        if self.book_writer is not None:
+            self.book_writer.write_book(book)
+        else:
+            self.library[self.sim + 1] = copy(book)
+
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -293,6 +320,16 @@ class GeneralGameState(ABC):
         """run_freespin trigger function should be defined in gamestate."""
         print("gamestate requires def run_freespin(), currently passing when calling runFreeSpin")
 
+    def replay_sim(self, betmode: str, sim: int, criteria: str) -> dict:
+        """Regenerate a single simulation in isolation, returns the JSON-ready book for book id sim + 1."""
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.library = {}
+        self.recorded_events = {}
+        self.betmode = betmode
+        self.criteria = criteria
+        self.run_spin(sim)
+        return self.library[sim + 1]
+
     def run_sims(
         self,
         betmode_copy_list,
@@ -305,18 +342,50 @@ class GeneralGameState(ABC):
         repeat_count,
         compress=True,
         write_event_list=True,
+        write_books=True,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished.
+        With write_books=False events are not constructed and only lookup tables, pay splits and force records are written."""
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
+        self.recorded_events = {}
         self.betmode = betmode
+        self.write_books = write_books
         self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim)
+        self.book_writer = BookWriter(
+            self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count),
+            self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count),
+            book_name=(
+                self.output_files.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress)
+                if write_books
+                else None
+            ),
+            regular_json=self.config.output_regular_json,
+            keep_event_examples=write_event_list and write_books,
+            compression_level=self.config.zstd_level,
+            compression_threads=self.config.zstd_threads,
+            window_log=self.config.zstd_window_log,
+            long_distance=self.config.zstd_long_distance,
+            dictionary=(
+                load_dictionary(self.output_files.get_book_dictionary_name(betmode))
+                if compress and write_books and self.config.zstd_dictionary
+                else None
+            ),
+            frame_books=self.config.zstd_frame_books,
+            serializer=get_book_serializer(self.config.book_serializer, self.config.compact_books),
+        )
+        try:
+            for sim in range(
+                thread_index * num_sims + (total_threads * num_sims) * repeat_count,
+                (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
+            ):
+                self.criteria = sim_to_criteria[sim]
+                self.run_spin(sim)
+        finally:
+            self.book_writer.close()
+        self.event_examples = self.book_writer.event_examples
+        self.book_stats = self.book_writer.get_stats()
+        self.book_writer = None
         
         mode_cost = self.get_current_betmode().get_cost()
         betmode_name = self.get_current_betmode().get_name()
@@ -387,16 +456,5 @@ class GeneralGameState(ABC):
             flush=True,
         )
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
         print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
-        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
-        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
-
-        if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
         betmode_copy_list.append(self.config.bet_modes)
@@ -0,0 +1,189 @@
+"""Book serialisers: the standard library encoder, or orjson/msgspec when installed, all producing identical bytes."""
+
+import json
+import re
+from warnings import warn
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+BOOK_SERIALIZERS = ("orjson", "msgspec", "json")
+FRAGMENT_MARK = "\x00{}\x00"
+FRAGMENT_PATTERN = re.compile(r'"\\u0000(\d+)\\u0000"')
+FRAGMENT_BYTES_PATTERN = re.compile(rb'"\\u0000(\d+)\\u0000"')
+# floats the standard library writes in exponent form (abs >= 1e16 or < 1e-4) are formatted differently by orjson
+# and msgspec ("1e16", "0.00001"), and non-finite floats are written as null instead of NaN/Infinity. Books containing
+# them (or text looking like them, including None values) use the standard library
+FLOAT_EXPONENT = re.compile(rb"e[-\d]")
+
+
+class JSONFragment:
+    """Pre-encoded JSON value stored in a book event, written verbatim by the book serialisers."""
+
+    __slots__ = ("json",)
+
+    def __init__(self, json_str: str):
+        self.json = json_str
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, JSONFragment):
+            return self.json == other.json
+        return json.loads(self.json) == other
+
+    def __repr__(self) -> str:
+        return f"JSONFragment({self.json})"
+
+    def to_value(self):
+        """Decoded value of the fragment."""
+        return json.loads(self.json)
+
+
+def json_default(obj):
+    """json.dumps() default hook, fragments are decoded (used where books are re-formatted, e.g. with indent)."""
+    if isinstance(obj, JSONFragment):
+        return obj.to_value()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONSerializer:
+    """
+    Standard library serialiser. Default books use the json.dumps() format (", " and ": " separators, non-ASCII
+    characters escaped). Compact books use "," and ":" separators and UTF-8 text, the format written by orjson and
+    msgspec. JSONFragment values are written verbatim and must be encoded in the same format (see dumps()).
+    """
+
+    name = "json"
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.item_separator = "," if compact else ", "
+        self.key_separator = ":" if compact else ": "
+
+    def dumps(self, obj) -> str:
+        """JSON string of obj, with pre-encoded fragments inserted."""
+        fragments = []
+        json_str = json.dumps(
+            obj,
+            separators=(self.item_separator, self.key_separator),
+            ensure_ascii=not self.compact,
+            default=get_fragment_hook(fragments),
+        )
+        if fragments:
+            json_str = FRAGMENT_PATTERN.sub(lambda match: fragments[int(match.group(1))], json_str)
+        return json_str
+
+    def encode(self, obj) -> bytes:
+        """UTF-8 encoded JSON of obj, passed to the (zstd) book file."""
+        return JSONSerializer.dumps(self, obj).encode("UTF-8")
+
+
+class OrjsonSerializer(JSONSerializer):
+    """orjson serialiser for compact books, books orjson cannot encode identically use the standard library."""
+
+    name = "orjson"
+
+    def __init__(self):
+        super().__init__(compact=True)
+
+    def dumps(self, obj) -> str:
+        return self.encode(obj).decode("UTF-8")
+
+    def encode(self, obj) -> bytes:
+        fragments = []
+        try:
+            json_bytes = orjson.dumps(obj, default=get_fragment_hook(fragments))
+        except TypeError:
+            return super().encode(obj)
+        if has_float_mismatch(json_bytes):
+            return super().encode(obj)
+        if fragments:
+            json_bytes = FRAGMENT_BYTES_PATTERN.sub(lambda match: fragments[int(match.group(1))].encode(), json_bytes)
+        return json_bytes
+
+
+class MsgspecSerializer(OrjsonSerializer):
+    """msgspec serialiser for compact books, books msgspec cannot encode identically use the standard library."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        super().__init__()
+        self.encoder = msgspec.json.Encoder(enc_hook=self.raw_fragment)
+
+    def __reduce__(self):
+        # msgspec encoders cannot be pickled, gamestates (and their BoardEncoder) are sent to worker processes
+        return (MsgspecSerializer, ())
+
+    @staticmethod
+    def raw_fragment(value):
+        """msgspec enc_hook, fragments are written verbatim."""
+        if isinstance(value, JSONFragment):
+            return msgspec.Raw(value.json)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def encode(self, obj) -> bytes:
+        try:
+            json_bytes = self.encoder.encode(obj)
+        except (TypeError, ValueError, OverflowError):
+            return JSONSerializer.encode(self, obj)
+        if has_float_mismatch(json_bytes):
+            return JSONSerializer.encode(self, obj)
+        return json_bytes
+
+
+def has_float_mismatch(json_bytes: bytes) -> bool:
+    """True if orjson/msgspec output may contain a float formatted differently by the standard library."""
+    return b"0.0000" in json_bytes or b"null" in json_bytes or FLOAT_EXPONENT.search(json_bytes) is not None
+
+
+def get_fragment_hook(fragments: list) -> callable:
+    """default hook replacing JSONFragment values by placeholder strings, fragments are collected in order."""
+
+    def add_fragment(value):
+        if isinstance(value, JSONFragment):
+            fragments.append(value.json)
+            return FRAGMENT_MARK.format(len(fragments) - 1)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return add_fragment
+
+
+def get_book_serializer(name: str = "auto", compact: bool = False) -> JSONSerializer:
+    """
+    Serialiser for config.book_serializer ("auto", "orjson", "msgspec" or "json") and config.compact_books.
+    orjson and msgspec cannot write the default (", ", ": ") format, default books always use the standard library.
+    "auto" selects the first installed of orjson, msgspec and the standard library.
+    """
+    if name != "auto" and name not in BOOK_SERIALIZERS:
+        raise ValueError(f"Unknown book serializer '{name}', expected 'auto' or one of {BOOK_SERIALIZERS}.")
+    if not compact:
+        if name not in ("auto", "json"):
+            warn(f"The {name} serializer only writes compact books (config.compact_books), using the json serializer.")
+        return JSONSerializer()
+    available = {"orjson": ORJSON_AVAILABLE, "msgspec": MSGSPEC_AVAILABLE, "json": True}
+    if name == "auto":
+        name = next(serializer for serializer in BOOK_SERIALIZERS if available[serializer])
+    elif not available[name]:
+        warn(f"{name} is not installed, using the json serializer.")
+        name = "json"
+    if name == "orjson":
+        return OrjsonSerializer()
+    if name == "msgspec":
+        return MsgspecSerializer()
+    return JSONSerializer(compact=True)
+
+
+def dumps_book(book: dict) -> str:
+    """json.dumps() of a book, JSONFragment values are replaced by their pre-encoded JSON."""
+    return JSONSerializer().dumps(book)
@@ -0,0 +1,318 @@
+"""Incremental output of simulation books, lookup tables and pay splits, and indexed reading of book files."""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from warnings import warn
+from src.write_data.book_serializer import JSONSerializer
+
+try:
+    import zstandard as zstd
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+class BookWriter:
+    """
+    Serialise each book as soon as its simulation is finished, so memory use does not grow with the batch size.
+    Books are streamed into a zstd frame (.zst), or written as .jsonl/.json. The lookup table and segmented
+    pay-split rows of every book are written in the same pass.
+    With frame_books > 0 compressed books are split into frames of frame_books books each, and the first book id,
+    number of books, byte offset and size of every frame are written to a sidecar index (see BookReader).
+    Books are encoded to bytes by the serializer (src/write_data/book_serializer.py, default: standard library).
+    """
+
+    def __init__(
+        self,
+        lookup_name: str,
+        segmented_name: str,
+        book_name: str = None,
+        regular_json: bool = False,
+        keep_event_examples: bool = False,
+        compression_level: int = 3,
+        compression_threads: int = 0,
+        window_log: int = 0,
+        long_distance: bool = False,
+        dictionary: "zstd.ZstdCompressionDict" = None,
+        frame_books: int = 0,
+        serializer: JSONSerializer = None,
+    ):
+        self.lookup_file = open(lookup_name, "w", encoding="UTF-8")
+        self.segmented_file = open(segmented_name, "w", encoding="UTF-8")
+        self.book_file = None
+        self.book_name = book_name
+        self.compress = False
+        if book_name is not None:
+            self.compress = book_name.endswith(".zst")
+            if self.compress:
+                compressor = get_zstd_compressor(
+                    compression_level, compression_threads, window_log, long_distance, dictionary
+                )
+                self.book_file = compressor.stream_writer(open(book_name, "wb"))
+            else:
+                self.book_file = open(book_name, "wb")
+        self.serializer = serializer if serializer is not None else JSONSerializer()
+        self.regular_json = regular_json and self.book_file is not None and not self.compress
+        self.frame_books = frame_books if self.compress else 0
+        self.frames = []
+        self.frame_offset = 0
+        self.frame_count = 0
+        self.keep_event_examples = keep_event_examples
+        self.event_examples = []
+        self.event_types = set()
+        self.num_books = 0
+        self.raw_bytes = 0
+        self.write_time = 0.0
+
+    def write_book(self, book: dict) -> None:
+        """Write a single JSON-ready book and its lookup/pay-split rows."""
+        self.lookup_file.write("{},1,{}\n".format(book["id"], book["payoutMultiplier"]))
+        self.segmented_file.write(
+            str(book["id"])
+            + ","
+            + str(book["criteria"])
+            + ","
+            + str(round(book["baseGameWins"], 2))
+            + ","
+            + str(round(book["freeGameWins"], 2))
+            + "\n"
+        )
+        if self.book_file is not None:
+            start_time = time.perf_counter()
+            if self.regular_json:
+                prefix = "[" if self.num_books == 0 else self.serializer.item_separator
+                book_bytes = prefix.encode("UTF-8") + self.serializer.encode(book)
+            else:
+                book_bytes = self.serializer.encode(book) + b"\n"
+            if self.frame_books > 0:
+                self.add_to_frame(book["id"])
+            self.book_file.write(book_bytes)
+            self.write_time += time.perf_counter() - start_time
+            self.raw_bytes += len(book_bytes)
+        if self.keep_event_examples:
+            self.record_event_types(book)
+        self.num_books += 1
+
+    def add_to_frame(self, book_id: int) -> None:
+        """Count the next book towards the current frame, a full frame is ended before the book is written.
+        The last frame is ended by close(), ending it here as well would append an empty frame."""
+        if self.frame_count == self.frame_books:
+            self.book_file.flush(zstd.FLUSH_FRAME)
+            self.end_frame(self.book_file.tell())
+        if self.frame_count == 0:
+            self.frames.append([book_id, 0, self.frame_offset, 0])
+        self.frame_count += 1
+
+    def end_frame(self, end_offset: int) -> None:
+        """Record the size of the current frame, the next book starts a new frame."""
+        self.frames[-1][1] = self.frame_count
+        self.frames[-1][3] = end_offset - self.frame_offset
+        self.frame_offset = end_offset
+        self.frame_count = 0
+
+    def record_event_types(self, book: dict) -> None:
+        """Keep books containing the first instance of each event type, used for write_library_events()."""
+        new_types = {event["type"] for event in book.get("events", [])} - self.event_types
+        if new_types:
+            self.event_types |= new_types
+            self.event_examples.append(book)
+
+    def get_stats(self) -> dict:
+        """Number of books, uncompressed book bytes and seconds spent writing (compressing) them."""
+        return {"books": self.num_books, "raw_bytes": self.raw_bytes, "write_time": self.write_time}
+
+    def close(self) -> None:
+        """Finish the zstd frame / JSON list and close all files."""
+        if self.book_file is not None:
+            if self.regular_json:
+                self.book_file.write(b"]" if self.num_books > 0 else b"[]")
+            self.book_file.close()
+            if self.frame_books > 0:
+                if self.frame_count > 0:
+                    self.end_frame(os.path.getsize(self.book_name))
+                write_book_index(get_index_name(self.book_name), self.frames)
+        self.lookup_file.close()
+        self.segmented_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def get_zstd_compressor(
+    level: int = 3,
+    threads: int = 0,
+    window_log: int = 0,
+    long_distance: bool = False,
+    dictionary: "zstd.ZstdCompressionDict" = None,
+) -> "zstd.ZstdCompressor":
+    """Compressor for book files. window_log=0 keeps the default window of the level, long_distance enables
+    long-distance matching which finds repeats (boards, event keys) further back than the regular match finder."""
+    params = zstd.ZstdCompressionParameters.from_level(
+        level, window_log=window_log, enable_ldm=long_distance, threads=threads, write_dict_id=True
+    )
+    return zstd.ZstdCompressor(dict_data=dictionary, compression_params=params)
+
+
+def get_dictionary_name(book_name: str) -> str:
+    """Trained dictionary stored next to a compressed book file, books_<mode>.jsonl.zst -> books_<mode>.dict."""
+    if book_name.endswith(".jsonl.zst"):
+        book_name = book_name[: -len(".jsonl.zst")]
+    return book_name + ".dict"
+
+
+def load_dictionary(dict_name: str) -> "zstd.ZstdCompressionDict":
+    """Load a trained dictionary, None if the file does not exist."""
+    if not os.path.isfile(dict_name):
+        return None
+    with open(dict_name, "rb") as f:
+        return zstd.ZstdCompressionDict(f.read())
+
+
+def train_book_dictionary(
+    sample_files: list, dict_name: str, dict_size: int, level: int = 3
+) -> "zstd.ZstdCompressionDict":
+    """Train a dictionary on the individual books of the given compressed files and save it to dict_name.
+    Returns None (and writes no file) if there are too few samples to train on."""
+    samples = []
+    for fname in sample_files:
+        with open(fname, "rb") as f:
+            with zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+                samples.extend(line for line in reader.read().split(b"\n") if line)
+    try:
+        dictionary = zstd.train_dictionary(dict_size, samples, level=level)
+    except zstd.ZstdError as err:
+        warn(f"Could not train book dictionary from {len(samples)} books ({err}), compressing without it.")
+        return None
+    with open(dict_name, "wb") as f:
+        f.write(dictionary.as_bytes())
+    return dictionary
+
+
+def recompress_file(file_name: str, compressor: "zstd.ZstdCompressor") -> None:
+    """Re-compress a zstd book file in place using the given compressor. Indexed files keep their frame layout."""
+    with open(file_name, "rb") as f:
+        with zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            data = reader.read()
+    index_name = get_index_name(file_name)
+    if not os.path.isfile(index_name):
+        with open(file_name, "wb") as f:
+            with compressor.stream_writer(f) as writer:
+                writer.write(data)
+        return
+    lines = data.split(b"\n")
+    frames = read_book_index(index_name)
+    with open(file_name, "wb") as f:
+        offset, first_line = 0, 0
+        for frame in frames:
+            frame_lines = lines[first_line : first_line + frame[1]]
+            frame_data = compressor.compress(b"".join(line + b"\n" for line in frame_lines))
+            f.write(frame_data)
+            frame[2], frame[3] = offset, len(frame_data)
+            offset += len(frame_data)
+            first_line += frame[1]
+    write_book_index(index_name, frames)
+
+
+def get_book_decompressor(book_name: str, dict_name: str = None) -> "zstd.ZstdDecompressor":
+    """Decompressor for a published book file, using its trained dictionary if one is stored next to it."""
+    dictionary = load_dictionary(dict_name or get_dictionary_name(book_name))
+    return zstd.ZstdDecompressor(dict_data=dictionary)
+
+
+def get_index_name(book_name: str) -> str:
+    """Sidecar frame index of a compressed book file, books_<mode>.jsonl.zst -> books_<mode>.index."""
+    if book_name.endswith(".jsonl.zst"):
+        book_name = book_name[: -len(".jsonl.zst")]
+    return book_name + ".index"
+
+
+def write_book_index(index_name: str, frames: list) -> None:
+    """Write one 'first book id,number of books,byte offset,compressed size' row per frame."""
+    with open(index_name, "w", encoding="UTF-8") as f:
+        for frame in frames:
+            f.write("{},{},{},{}\n".format(*frame))
+
+
+def read_book_index(index_name: str) -> list:
+    """Frames of a book index, as [first book id, number of books, byte offset, compressed size] lists."""
+    with open(index_name, "r", encoding="UTF-8") as f:
+        return [[int(val) for val in line.split(",")] for line in f if line.strip()]
+
+
+def merge_book_indexes(book_files: list, merged_book_name: str) -> bool:
+    """Write the index of book files concatenated into merged_book_name, shifting frame offsets by the size of
+    the preceding files. Returns False (and removes any stale index) if not every file is indexed."""
+    merged_index_name = get_index_name(merged_book_name)
+    if not all(os.path.isfile(get_index_name(fname)) for fname in book_files):
+        if os.path.isfile(merged_index_name):
+            os.remove(merged_index_name)
+        return False
+    frames, file_offset = [], 0
+    for fname in book_files:
+        for first_id, num_books, offset, size in read_book_index(get_index_name(fname)):
+            frames.append([first_id, num_books, file_offset + offset, size])
+        file_offset += os.path.getsize(fname)
+    write_book_index(merged_index_name, frames)
+    return True
+
+
+class BookReader:
+    """
+    Random access to single books of an indexed .jsonl.zst book file. Fetching a book seeks to its frame and
+    decompresses only that frame, the most recently read frame is kept for sequential lookups.
+    """
+
+    def __init__(self, book_name: str, index_name: str = None, dict_name: str = None):
+        index_name = index_name or get_index_name(book_name)
+        if not os.path.isfile(index_name):
+            raise FileNotFoundError(f"No book index {index_name}, create books with config.zstd_frame_books > 0.")
+        self.frames = read_book_index(index_name)
+        self.first_ids = [frame[0] for frame in self.frames]
+        self.num_books = sum(frame[1] for frame in self.frames)
+        self.decompressor = get_book_decompressor(book_name, dict_name)
+        self.book_file = open(book_name, "rb")
+        self.cached_frame = None
+        self.cached_lines = None
+
+    def read_frame(self, frame_index: int) -> list:
+        """Raw JSON lines of all books within a frame."""
+        if frame_index != self.cached_frame:
+            _, num_books, offset, size = self.frames[frame_index]
+            self.book_file.seek(offset)
+            data = self.decompressor.decompressobj().decompress(self.book_file.read(size))
+            self.cached_lines = data.split(b"\n")[:num_books]
+            self.cached_frame = frame_index
+        return self.cached_lines
+
+    def get_book(self, book_id: int) -> dict:
+        """JSON book of a single book id."""
+        frame_index = bisect_right(self.first_ids, book_id) - 1
+        if frame_index < 0 or book_id >= self.first_ids[frame_index] + self.frames[frame_index][1]:
+            raise KeyError(f"Book id {book_id} is not in the index.")
+        return json.loads(self.read_frame(frame_index)[book_id - self.first_ids[frame_index]])
+
+    def get_books(self, book_ids) -> list:
+        """JSON books of several book ids, read in id order."""
+        return [self.get_book(book_id) for book_id in sorted(book_ids)]
+
+    def iter_books(self):
+        """All books in file order, one frame at a time."""
+        for frame_index in range(len(self.frames)):
+            for line in self.read_frame(frame_index):
+                yield json.loads(line)
+
+    def close(self) -> None:
+        """Close the book file."""
+        self.book_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,106 @@
+"""SHA-256 hashes of output files, computed while the files are written and reused until a file changes.
+Hashes are kept in a sidecar manifest (sha256_manifest.json) in the directory of each hashed file, so later processes
+(generate_configs, upload checks, get_file_hash.py) do not need to re-read large book and lookup files."""
+
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_NAME = "sha256_manifest.json"
+
+# absolute path -> (size, mtime_ns, sha256 hex digest) of files hashed in this process
+_file_hashes = {}
+_manifest_lock = threading.Lock()
+
+
+class HashedFile:
+    """Binary output file which hashes all bytes as they are written, the hash is recorded when it is closed."""
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.file = open(file_name, "wb")
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        return self.file.write(data)
+
+    def close(self) -> str:
+        """Close the file, returns the hex digest."""
+        if not self.file.closed:
+            self.file.close()
+            record_file_hash(self.file_name, self.sha256.hexdigest())
+        return self.sha256.hexdigest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def hash_file(file_name: str, chunk_size: int = 1 << 20) -> str:
+    """Hex digest of a file, read in chunks."""
+    sha256 = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_manifest_name(file_name: str) -> str:
+    """Sidecar manifest holding the hashes of files in the directory of file_name."""
+    return os.path.join(os.path.dirname(os.path.abspath(file_name)), MANIFEST_NAME)
+
+
+def read_manifest(manifest_name: str) -> dict:
+    """Manifest entries {file name: {"size", "mtimeNs", "sha256"}}, empty if missing or unreadable."""
+    try:
+        with open(manifest_name, "r", encoding="UTF-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def record_file_hash(file_name: str, sha256: str, persist: bool = True) -> None:
+    """Remember the hash of a file which has just been written, together with its size and modification time.
+    With persist the entry is also stored in the sidecar manifest."""
+    stat = os.stat(file_name)
+    _file_hashes[os.path.abspath(file_name)] = (stat.st_size, stat.st_mtime_ns, sha256)
+    if not persist:
+        return
+    manifest_name = get_manifest_name(file_name)
+    with _manifest_lock:
+        manifest = read_manifest(manifest_name)
+        manifest[os.path.basename(file_name)] = {"size": stat.st_size, "mtimeNs": stat.st_mtime_ns, "sha256": sha256}
+        temp_name = f"{manifest_name}.{os.getpid()}.tmp"
+        with open(temp_name, "w", encoding="UTF-8") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+        os.replace(temp_name, manifest_name)
+
+
+def get_file_sha256(file_name: str) -> str:
+    """Hash recorded while the file was written (in this process or in the sidecar manifest). The file is re-hashed
+    if its size or modification time changed, stale manifest entries are updated."""
+    stat = os.stat(file_name)
+    recorded = _file_hashes.get(os.path.abspath(file_name))
+    if recorded is not None and recorded[:2] == (stat.st_size, stat.st_mtime_ns):
+        return recorded[2]
+    entry = read_manifest(get_manifest_name(file_name)).get(os.path.basename(file_name))
+    if entry is not None and (entry["size"], entry["mtimeNs"]) == (stat.st_size, stat.st_mtime_ns):
+        _file_hashes[os.path.abspath(file_name)] = (stat.st_size, stat.st_mtime_ns, entry["sha256"])
+        return entry["sha256"]
+    sha256 = hash_file(file_name)
+    record_file_hash(file_name, sha256, persist=entry is not None)
+    return sha256
+
+
+def concatenate_files(file_list: list, out_name: str) -> str:
+    """Append the bytes of all files into out_name, returns the hash of the output."""
+    with HashedFile(out_name) as out_file:
+        for file_name in file_list:
+            with open(file_name, "rb") as in_file:
+                for chunk in iter(lambda: in_file.read(1 << 20), b""):
+                    out_file.write(chunk)
+    return out_file.close()
@@ -0,0 +1,120 @@
+"""Bitmap index of recorded force descriptions and lookup-table payouts, used for fast book-id searches."""
+
+import json
+import numpy as np
+
+
+class ForceQuery:
+    """Set of book ids as a boolean mask over all books of a mode, combined with & (AND), | (OR) and ~ (NOT)."""
+
+    def __init__(self, mask: np.ndarray):
+        self.mask = mask
+
+    def __and__(self, other: "ForceQuery") -> "ForceQuery":
+        return ForceQuery(self.mask & other.mask)
+
+    def __or__(self, other: "ForceQuery") -> "ForceQuery":
+        return ForceQuery(self.mask | other.mask)
+
+    def __invert__(self) -> "ForceQuery":
+        return ForceQuery(~self.mask)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.mask))
+
+    def ids(self) -> np.ndarray:
+        """Sorted book ids in the set."""
+        return np.flatnonzero(self.mask).astype(np.uint32) + 1
+
+
+class ForceIndex:
+    """
+    Book ids of every recorded description, stored roaring-style: sparse descriptions as sorted uint32 id arrays
+    and dense descriptions as packed bitsets. Lookup-table payouts are stored alongside for payout-range filters.
+    """
+
+    def __init__(self, descriptions: list, containers: list, payouts: np.ndarray):
+        self.descriptions = descriptions
+        self.containers = containers
+        self.payouts = payouts
+        self.num_books = len(payouts)
+
+    @classmethod
+    def from_recorded_wins(cls, recorded_wins: list, payouts: np.ndarray) -> "ForceIndex":
+        """Build from merged (description, book id array) pairs, payouts are indexed by book id - 1."""
+        descriptions = [description for description, _ in recorded_wins]
+        containers = [np.asarray(book_ids, dtype=np.uint32) for _, book_ids in recorded_wins]
+        return cls(descriptions, containers, np.asarray(payouts))
+
+    def save(self, name: str) -> None:
+        """Write as compressed .npz, each description uses the smaller of an id array and a bitset."""
+        arrays = {"descriptions": np.array(json.dumps(self.descriptions)), "payouts": self.payouts}
+        for idx in range(len(self.descriptions)):
+            book_ids = self.get_book_ids(idx)
+            if 32 * len(book_ids) < self.num_books:
+                arrays[f"ids_{idx}"] = book_ids
+            else:
+                arrays[f"bits_{idx}"] = np.packbits(self.get_mask(idx))
+        with open(name, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, name: str) -> "ForceIndex":
+        """Load an index written by save()."""
+        with np.load(name) as data:
+            descriptions = [
+                tuple(tuple(key_val) for key_val in desc) for desc in json.loads(str(data["descriptions"]))
+            ]
+            payouts = data["payouts"]
+            containers = []
+            for idx in range(len(descriptions)):
+                if f"ids_{idx}" in data.files:
+                    containers.append(data[f"ids_{idx}"])
+                else:
+                    containers.append(np.unpackbits(data[f"bits_{idx}"], count=len(payouts)).astype(bool))
+        return cls(descriptions, containers, payouts)
+
+    def get_book_ids(self, description_index: int) -> np.ndarray:
+        """Sorted book ids recording a description."""
+        container = self.containers[description_index]
+        if container.dtype == bool:
+            return np.flatnonzero(container).astype(np.uint32) + 1
+        return container
+
+    def get_mask(self, description_index: int) -> np.ndarray:
+        """Boolean mask of the books recording a description."""
+        container = self.containers[description_index]
+        if container.dtype == bool:
+            return container
+        mask = np.zeros(self.num_books, dtype=bool)
+        mask[container.astype(np.int64) - 1] = True
+        return mask
+
+    def match_descriptions(self, search_keys: dict) -> list:
+        """Indexes of all descriptions containing every given key/value pair."""
+        search_items = {(str(key), str(val)) for key, val in search_keys.items()}
+        return [idx for idx, description in enumerate(self.descriptions) if search_items.issubset(description)]
+
+    def where(self, **search_keys) -> ForceQuery:
+        """Books with at least one recorded description matching all keys, i.e where(kind=5, symbol="H1")."""
+        mask = np.zeros(self.num_books, dtype=bool)
+        for idx in self.match_descriptions(search_keys):
+            container = self.containers[idx]
+            if container.dtype == bool:
+                mask |= container
+            else:
+                mask[container.astype(np.int64) - 1] = True
+        return ForceQuery(mask)
+
+    def payout_range(self, min_payout: int = None, max_payout: int = None) -> ForceQuery:
+        """Books with min_payout <= payoutMultiplier < max_payout, either bound can be omitted."""
+        mask = np.ones(self.num_books, dtype=bool)
+        if min_payout is not None:
+            mask &= self.payouts >= min_payout
+        if max_payout is not None:
+            mask &= self.payouts < max_payout
+        return ForceQuery(mask)
+
+    def all_books(self) -> ForceQuery:
+        """Every book of the mode."""
+        return ForceQuery(np.ones(self.num_books, dtype=bool))
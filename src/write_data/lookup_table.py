@@ -0,0 +1,53 @@
+"""Binary companion files of csv lookup tables, memory-mapped by analytics and verification tools."""
+
+import os
+import warnings
+import numpy as np
+
+LOOKUP_DTYPE = np.dtype([("id", "<u4"), ("weight", "<u8"), ("payout", "<u8")])
+
+
+def get_binary_lookup_name(csv_name: str) -> str:
+    """Binary table stored next to a csv lookup table, lookUpTable_<mode>_0.csv -> lookUpTable_<mode>_0.npy."""
+    return os.path.splitext(csv_name)[0] + ".npy"
+
+
+def read_lookup_csv(csv_name: str) -> np.ndarray:
+    """Parse an id,weight,payout csv lookup table into a structured LOOKUP_DTYPE array."""
+    if os.path.getsize(csv_name) == 0:
+        return np.zeros(0, dtype=LOOKUP_DTYPE)
+    try:
+        with warnings.catch_warnings():
+            # numpy deprecates parsing "100.0" as an integer, such tables are read by the float parser below
+            warnings.simplefilter("error", DeprecationWarning)
+            table = np.loadtxt(csv_name, delimiter=",", dtype=np.int64, ndmin=2)
+    except (ValueError, OverflowError, DeprecationWarning):
+        # Values written as floats (i.e 100.0) are accepted if they are non-negative integers
+        table = np.loadtxt(csv_name, delimiter=",", dtype=np.float64, ndmin=2)
+        if np.any(table != np.floor(table)):
+            raise ValueError(f"{csv_name} contains non-integer or negative values.")
+    if np.any(table < 0):
+        raise ValueError(f"{csv_name} contains non-integer or negative values.")
+    table = table.astype(np.uint64)
+    lookup = np.empty(len(table), dtype=LOOKUP_DTYPE)
+    lookup["id"], lookup["weight"], lookup["payout"] = table[:, 0], table[:, 1], table[:, 2]
+    return lookup
+
+
+def write_binary_lookup(csv_name: str, lookup: np.ndarray = None) -> np.ndarray:
+    """Write the binary companion of a csv lookup table, returns the structured table."""
+    if lookup is None:
+        lookup = read_lookup_csv(csv_name)
+    np.save(get_binary_lookup_name(csv_name), lookup)
+    return lookup
+
+
+def load_lookup_table(csv_name: str, mmap: bool = True) -> np.ndarray:
+    """Structured id/weight/payout array of a lookup table. The binary companion is memory-mapped if it is at
+    least as recent as the csv, otherwise (i.e the csv was re-written by the optimizer) the csv is parsed."""
+    binary_name = get_binary_lookup_name(csv_name)
+    if os.path.isfile(binary_name) and (
+        not os.path.isfile(csv_name) or os.path.getmtime(binary_name) >= os.path.getmtime(csv_name)
+    ):
+        return np.load(binary_name, mmap_mode="r" if mmap else None)
+    return read_lookup_csv(csv_name)
@@ -5,12 +5,8 @@ import os
 import shutil
 import warnings
 from collections import defaultdict
-from utils.get_file_hash import get_hash
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_lookup_length,
-    get_distribution_moments,
-)
+from src.write_data.file_hash import HashedFile, get_file_sha256
+from utils.analysis.distribution_functions import get_lookup_length, load_win_distribution
 
 
 def copy_and_rename_csv(filepath: str) -> None:
@@ -309,16 +305,15 @@ def make_fe_config(gamestate, json_padding=True, assign_properties=True, **kwarg
         json_info["paddingReels"] = gamestate.config.paddingReels
 
     f_name = os.path.join(gamestate.output_files.config_path, f"config_fe_{gamestate.config.game_id}.json")
-    fe_json = open(f_name, "w", encoding="UTF-8")
-    fe_json.write(json.dumps(json_info, indent=4))
-    fe_json.close()
+    with HashedFile(f_name) as fe_json:
+        fe_json.write(json.dumps(json_info, indent=4).encode("UTF-8"))
 
 
 def make_be_config(gamestate):
     """ "Generate config.json for RGS to retrieve game details and hash-values."""
     config = gamestate.config
 
-    fe_config_sha = get_hash(gamestate.output_files.configs["paths"]["fe_config"])
+    fe_config_sha = get_file_sha256(gamestate.output_files.configs["paths"]["fe_config"])
     available_bm = gamestate.config.bet_modes
 
     # General game data
@@ -345,7 +340,7 @@ def make_be_config(gamestate):
     be_info["providerNumber"] = int(config.provider_number)
     be_info["standardForceFile"] = {
         "file": "force.json",
-        "sha256": get_hash(os.path.join(gamestate.output_files.force_path, "force.json")),
+        "sha256": get_file_sha256(os.path.join(gamestate.output_files.force_path, "force.json")),
     }
 
     # Betmode specific data
@@ -357,9 +352,8 @@ def make_be_config(gamestate):
             base_table = gamestate.output_files.lookups[bet.get_name()]["paths"]["base_lookup"]
             copy_and_rename_csv(base_table)
 
-        lut_sha_value = get_hash(lut_table)
-        dist = make_win_distribution(lut_table)
-        _, std_val, _, _ = get_distribution_moments(dist)
+        lut_sha_value = get_file_sha256(lut_table)
+        _, std_val, _, _ = load_win_distribution(lut_table).moments()
         std_val = round(std_val / bet.get_cost(), 2)
         booklength = get_lookup_length(lut_table)
 
@@ -378,13 +372,13 @@ def make_be_config(gamestate):
         }
         data_loc = gamestate.output_files.books[bet.get_name()]["paths"]["books_compressed"]
         try:
-            data_sha = get_hash(data_loc)
+            data_sha = get_file_sha256(data_loc)
         except FileNotFoundError:
             data_sha = ""
             warnings.warn("Compressed books file not found. Hash is empty.")
 
         force_loc = gamestate.output_files.force[bet.get_name()]["paths"]["force_record"]
-        force_sha = get_hash(force_loc)
+        force_sha = get_file_sha256(force_loc)
 
         dic["booksFile"] = {
             "file": gamestate.output_files.books[bet.get_name()]["names"]["books_compressed"],
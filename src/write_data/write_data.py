@@ -1,12 +1,22 @@
 """Handles writing all game game files"""
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 import shutil
 import os
-import hashlib
 import json
-import ast
+import numpy as np
+from src.write_data.force_index import ForceIndex
+from src.write_data.lookup_table import load_lookup_table, write_binary_lookup
+from src.write_data.book_serializer import json_default
+from src.write_data.file_hash import HashedFile, concatenate_files, get_file_sha256, record_file_hash
+from src.write_data.book_writer import (
+    get_zstd_compressor,
+    merge_book_indexes,
+    recompress_file,
+    train_book_dictionary,
+)
 # Conditional import for zstandard
 try:
     import zstandard as zstd
@@ -16,16 +26,9 @@ except ImportError:
 
 
 def get_sha_256(file_to_hash: str):
-    """Get human readable hash of file."""
+    """Get human readable hash of file, recorded when the file was written if it has not changed since."""
     try:
-        with open(file_to_hash, "rb") as f:
-            sha256_file = hashlib.sha256()
-            while True:
-                data = f.read(65536)
-                if not data:
-                    break
-                sha256_file.update(data)
-        sha256_hexRep = sha256_file.hexdigest()
+        sha256_hexRep = get_file_sha256(file_to_hash)
     except FileNotFoundError:
         warn(f"{file_to_hash} is empty.\nCould not create hash")
         sha256_hexRep = ""
@@ -71,41 +74,12 @@ def make_force_json(gamestate: object):
 
 
 def get_force_options(force_results: dict):
-    """Return JSON ready force keys."""
+    """Return JSON ready force keys, values are sorted so force.json does not depend on set iteration order."""
     force_keys = defaultdict(set)
     for force in force_results.keys():
         for key, val in force:
             force_keys[str(key)].add(val)
-    return {key: list(val) for key, val in force_keys.items()}
-
-
-def make_lookup_tables(gamestate: object, name: str):
-    """Write lookup tables for all simulations."""
-    file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
-        file.write("{},1,{}\n".format(gamestate.library[sim]["id"], gamestate.library[sim]["payoutMultiplier"]))
-    file.close()
-
-
-def make_lookup_pay_split(gamestate: object, name: str):
-    """Record win values from basegame and freegame types."""
-    file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
-        file.write(
-            str(gamestate.library[sim]["id"])
-            + ","
-            + str(gamestate.library[sim]["criteria"])
-            + ","
-            + str(round(gamestate.library[sim]["baseGameWins"], 2))
-            + ","
-            + str(round(gamestate.library[sim]["freeGameWins"], 2))
-            + "\n"
-        )
-    file.close()
+    return {key: sorted(val, key=lambda v: (type(v).__name__, v)) for key, val in force_keys.items()}
 
 
 def write_library_events(gamestate: object, library: list, gametype: str):
@@ -120,7 +94,7 @@ def write_library_events(gamestate: object, library: list, gametype: str):
                 item_keys = instance.keys()
                 dict_details = {key: instance[key] for key in item_keys if key != "index"}
                 event_items[lib_event] = dict_details
-    json_object = json.dumps(event_items, indent=4)
+    json_object = json.dumps(event_items, indent=4, default=json_default)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
         "w",
@@ -129,18 +103,63 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
-def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
+def print_compression_summary(mode_stats: dict) -> None:
+    """Print the book size, compression ratio and throughput of every simulated mode."""
+    print("Book output summary:")
+    print(
+        "{:<20}{:>10}{:>14}{:>14}{:>9}{:>16}{:>16}".format(
+            "mode", "books", "raw MB", "file MB", "ratio", "write MB/s", "mode MB/s"
+        )
+    )
+    for mode, stats in mode_stats.items():
+        raw_mb = stats.get("raw_bytes", 0) / 1e6
+        file_mb = stats["file_bytes"] / 1e6
+        ratio = raw_mb / file_mb if file_mb > 0 else 0.0
+        # write MB/s is per worker-second spent encoding books and writing them into the (compressed) book file
+        write_rate = raw_mb / stats["write_time"] if stats.get("write_time", 0) > 0 else 0.0
+        mode_rate = raw_mb / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+        print(
+            "{:<20}{:>10}{:>14.2f}{:>14.2f}{:>9.2f}{:>16.1f}{:>16.1f}".format(
+                mode, stats.get("books", 0), raw_mb, file_mb, ratio, write_rate, mode_rate
+            )
+        )
+
+
+def reset_book_dictionary(gamestate: object, betmode: str) -> None:
+    """Remove a dictionary left over from a previous run, so it is not applied to newly written books."""
+    dict_name = gamestate.output_files.get_book_dictionary_name(betmode)
+    if os.path.isfile(dict_name):
+        os.remove(dict_name)
+
+
+def train_mode_dictionary(gamestate: object, betmode: str, threads: int) -> None:
+    """Train the mode dictionary on the books of the first batch and re-compress that batch with it.
+    All later batches load the saved dictionary in BookWriter."""
+    config = gamestate.config
+    sample_files = [
+        gamestate.output_files.get_temp_multi_thread_name(betmode, thread, 0, True) for thread in range(threads)
+    ]
+    dictionary = train_book_dictionary(
+        sample_files, gamestate.output_files.get_book_dictionary_name(betmode), config.zstd_dict_size, config.zstd_level
+    )
+    if dictionary is None:
+        return
+    compressor = get_zstd_compressor(
+        config.zstd_level, config.zstd_threads, config.zstd_window_log, config.zstd_long_distance, dictionary
+    )
+    for fname in sample_files:
+        recompress_file(fname, compressor)
+    print("Trained", len(dictionary.as_bytes()), "byte book dictionary for", betmode)
+    warn(
+        f"Books of mode '{betmode}' are compressed with an experimental trained dictionary and can only be read "
+        f"together with {gamestate.output_files.get_book_dictionary_name(betmode)}."
+    )
+
+
+def combine_book_files(
+    threads: int, game_id: str, betmode: str, gamestate: object, num_repeats: int, compress: bool = True
 ):
-    """Combine temporary lookup tables and force files into a single output."""
-    print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    """Combine temporary book files from all threads and batches into the final book output."""
     file_list = []
     for repeat_index in range(num_repeats):
         for thread in range(threads):
@@ -153,19 +172,10 @@ def output_lookup_and_force_files(
         pass
         # Write a temporary file
     if compress:
-
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+        # zstd frames are concatenable, the per-thread compressed files are appended without recompression
+        final_book_name = gamestate.output_files.get_final_book_name(betmode, True)
+        concatenate_files(file_list, final_book_name)
+        merge_book_indexes(file_list, final_book_name)
     elif compress and not ZSTD_AVAILABLE:
         print("Warning: zstandard not available, falling back to uncompressed output")
         with open(
@@ -197,23 +207,64 @@ def output_lookup_and_force_files(
                         else:
                             outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
 
+
+def output_lookup_and_force_files(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    books: bool = True,
+    pool: object = None,
+):
+    """Combine temporary lookup tables, pay splits, force files and books into a single output per mode.
+    The merges are independent: books, lookup table and pay splits are merged on I/O threads while the force records
+    are merged on the simulation pool (or another thread without one). Hashes are computed while files are written."""
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    output_files = gamestate.output_files
+    batches = [(thread, repeat_index) for repeat_index in range(num_repeats) for thread in range(threads)]
+    force_file_list = [output_files.get_temp_force_name(betmode, thread, repeat) for thread, repeat in batches]
+    lookup_file_list = [output_files.get_temp_lookup_name(betmode, thread, repeat) for thread, repeat in batches]
+    segmented_file_list = [output_files.get_temp_segmented_name(betmode, thread, repeat) for thread, repeat in batches]
+    force_record_path = os.path.join(output_files.force_path, f"force_record_{betmode}.json")
+
+    if books:
+        print("Saving books for ", game_id, "in", betmode)
     print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
+    print("Saving LUTs for", game_id, "in", betmode)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        if pool is not None:
+            force_task = pool.apply_async(write_force_record, (force_file_list, force_record_path))
+        else:
+            force_task = executor.submit(write_force_record, force_file_list, force_record_path)
+        tasks = [
+            executor.submit(combine_lookup_files, gamestate, betmode, lookup_file_list),
+            executor.submit(concatenate_files, segmented_file_list, output_files.get_final_segmented_name(betmode)),
+        ]
+        if books:
+            tasks.append(
+                executor.submit(combine_book_files, threads, game_id, betmode, gamestate, num_repeats, compress)
             )
 
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
+        recorded_wins, force_options, force_sha = force_task.get() if pool is not None else force_task.result()
+        # the manifest entry is written by the worker, only this process' registry needs the hash
+        record_file_hash(force_record_path, force_sha, persist=False)
+        update_force_options(gamestate, force_options)
+        tasks[0].result()
+        write_force_index(gamestate, betmode, recorded_wins)
+        for task in tasks[1:]:
+            task.result()
+
+
+def write_force_record(file_list: list, force_record_path: str) -> tuple:
+    """Merge the temporary force files of a mode and write force_record_<mode>.json.
+    Returns the recorded wins, the force options and the hash of the record file."""
+    recorded_wins = merge_recorded_wins(file_list)
+    force_results_dict = {}
+    for description, book_ids in recorded_wins:
+        force_results_dict[description] = {"timesTriggered": len(book_ids), "bookIds": book_ids.tolist()}
 
     force_results_dict_just_for_rob = []
     for force_combination in force_results_dict:
@@ -228,88 +279,82 @@ def output_lookup_and_force_files(
         force_results_dict_just_for_rob.append(force_dict)
 
     json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
-    force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    with HashedFile(force_record_path) as file:
+        file.write(json_object_for_rob.encode("UTF-8"))
+    return recorded_wins, get_force_options(force_results_dict), file.close()
 
-    forceResultKeys = get_force_options(force_results_dict)
+
+def update_force_options(gamestate: object, force_options: dict) -> None:
+    """Add the force options of the current betmode to force.json."""
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
     try:
         with open(json_file_path, "r", encoding="UTF-8") as file:
             data = json.load(file)
     except FileNotFoundError:
         data = {}
-    data[gamestate.get_current_betmode().get_name()] = forceResultKeys
+    data[gamestate.get_current_betmode().get_name()] = force_options
     json_object = json.dumps(data, indent=4)
-    with open(json_file_path, "w", encoding="UTF-8") as file:
-        file.write(json_object)
-
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
-    print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    with HashedFile(json_file_path) as file:
+        file.write(json_object.encode("UTF-8"))
 
-    with open(
-        gamestate.output_files.get_final_lookup_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in weights_plus_wins_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
 
+def combine_lookup_files(gamestate: object, betmode: str, file_list: list) -> None:
+    """Merge the temporary lookup tables and write the binary lookup table. The optimized (_0) table is created
+    from the merged table if it does not exist."""
+    final_lookup_name = gamestate.output_files.get_final_lookup_name(betmode)
+    lookup_sha = concatenate_files(file_list, final_lookup_name)
+    lookup = write_binary_lookup(final_lookup_name)
     # Write _0 file if it does not exist
-    if not (os.path.exists(gamestate.output_files.get_optimized_lookup_name(betmode))):
-        shutil.copy(
-            gamestate.output_files.get_final_lookup_name(betmode),
-            gamestate.output_files.get_optimized_lookup_name(betmode),
-        )
-    with open(
-        gamestate.output_files.get_final_segmented_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in segmented_lut_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
-
-
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    # Convert Symbol objects to strings before JSON serialization
-    json_objects = []
-    for item in gamestate.library.values():
-        if hasattr(item, 'name'):  # If it's a Symbol object
-            json_objects.append(json.dumps({"name": item.name}))
-        else:
-            json_objects.append(json.dumps(item))
-    
-    combined_data = "\n".join(json_objects) + "\n"
-
-    if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
-    else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
+    optimized_lookup_name = gamestate.output_files.get_optimized_lookup_name(betmode)
+    if not (os.path.exists(optimized_lookup_name)):
+        shutil.copy(final_lookup_name, optimized_lookup_name)
+        record_file_hash(optimized_lookup_name, lookup_sha)
+        write_binary_lookup(optimized_lookup_name, lookup)
+
+
+def write_force_index(gamestate: object, betmode: str, recorded_wins: list) -> None:
+    """Bitmap index of the merged force records and lookup-table payouts, used by ForceTool searches."""
+    lookup = load_lookup_table(gamestate.output_files.get_final_lookup_name(betmode))
+    book_ids = lookup["id"].astype(np.int64)
+    payouts = np.zeros(int(book_ids.max(initial=0)), dtype=np.int64)
+    payouts[book_ids - 1] = lookup["payout"]
+    ForceIndex.from_recorded_wins(recorded_wins, payouts).save(gamestate.output_files.get_force_index_name(betmode))
 
 
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary file generation for wins/recorded results.
+    Descriptions are stored as JSON, the book ids of all descriptions as one concatenated uint32 array."""
+    descriptions = list(gamestate.recorded_events.keys())
+    book_ids = list(gamestate.recorded_events.values())
+    with open(name, "wb") as f:
+        np.savez(
+            f,
+            descriptions=np.array(json.dumps(descriptions)),
+            counts=np.array([len(ids) for ids in book_ids], dtype=np.int64),
+            book_ids=np.concatenate([np.asarray(ids, dtype=np.uint32) for ids in book_ids] or [np.zeros(0, np.uint32)]),
+        )
+
+
+def merge_recorded_wins(file_list: list) -> list:
+    """Merge temporary recorded win files, returns (description, book id array) pairs in order of first appearance.
+    Book ids of each description keep the file order, so they remain sorted."""
+    description_index = {}
+    all_indexes, all_ids = [], []
+    for filename in file_list:
+        with np.load(filename) as force_chunk:
+            chunk_descriptions = [
+                tuple(tuple(key_val) for key_val in description)
+                for description in json.loads(str(force_chunk["descriptions"]))
+            ]
+            chunk_indexes = np.array(
+                [description_index.setdefault(desc, len(description_index)) for desc in chunk_descriptions],
+                dtype=np.int64,
+            )
+            all_indexes.append(np.repeat(chunk_indexes, force_chunk["counts"]))
+            all_ids.append(force_chunk["book_ids"])
+    if len(description_index) == 0:
+        return []
+    all_indexes = np.concatenate(all_indexes)
+    all_ids = np.concatenate(all_ids)[np.argsort(all_indexes, kind="stable")]
+    counts = np.bincount(all_indexes, minlength=len(description_index))
+    return list(zip(description_index.keys(), np.split(all_ids, np.cumsum(counts)[:-1])))
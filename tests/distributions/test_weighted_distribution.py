@@ -0,0 +1,53 @@
+"""Test precompiled weighted distribution sampling."""
+
+import random
+import numpy as np
+from src.calculations.statistics import WeightedDistribution, get_random_outcome
+from src.config.distributions import Distribution
+
+
+def test_draw_frequencies():
+    "Single draws follow the assigned weights."
+    dist = WeightedDistribution({2: 10, 3: 20, 5: 70})
+    rng = random.Random(1)
+    counts = {2: 0, 3: 0, 5: 0}
+    num_draws = 100000
+    for _ in range(num_draws):
+        counts[get_random_outcome(dist, rng=rng)] += 1
+
+    assert abs(counts[2] / num_draws - 0.1) < 0.01
+    assert abs(counts[3] / num_draws - 0.2) < 0.01
+    assert abs(counts[5] / num_draws - 0.7) < 0.01
+
+
+def test_batch_draw_and_zero_weights():
+    "Batched draws never return zero-weight values."
+    dist = WeightedDistribution({"BR0": 3, "FR0": 0, "WCAP": 1})
+    draws = dist.draw_batch(50000, np.random.default_rng(3))
+    assert "FR0" not in set(draws)
+    assert abs(np.mean(draws == "BR0") - 0.75) < 0.01
+
+
+def test_modification_recompiles():
+    "Changing the weights invalidates the compiled table."
+    dist = WeightedDistribution({"A": 1})
+    assert dist.draw() == "A"
+    dist["B"] = 1e12
+    del dist["A"]
+    assert dist.draw() == "B"
+
+
+def test_distribution_conditions_compiled():
+    "Betmode distribution weight tables are converted at setup."
+    dist = Distribution(
+        criteria="basegame",
+        quota=1,
+        conditions={
+            "reel_weights": {"basegame": {"BR0": 1}},
+            "scatter_triggers": {3: 10, 4: 1},
+        },
+    )
+    conditions = dist._conditions
+    assert isinstance(conditions["reel_weights"]["basegame"], WeightedDistribution)
+    assert isinstance(conditions["scatter_triggers"], WeightedDistribution)
+    assert conditions["force_freegame"] is False
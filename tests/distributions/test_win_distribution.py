@@ -0,0 +1,39 @@
+"""Test numpy win-distribution statistics of lookup tables."""
+
+from math import sqrt
+import numpy as np
+from src.write_data.lookup_table import LOOKUP_DTYPE
+from utils.analysis.distribution_functions import WinDistribution
+
+
+def test_lookup_statistics():
+    """Rows with equal payouts are combined and statistics match the direct (weighted) definitions."""
+    rows = [(1, 2, 0), (2, 1, 150), (3, 1, 0), (4, 3, 50), (5, 1, 1000)]
+    lookup = np.array(rows, dtype=LOOKUP_DTYPE)
+    dist = WinDistribution.from_lookup(lookup)
+    assert dist.to_dict(normalize=False) == {0.0: 3.0, 0.5: 3.0, 1.5: 1.0, 10.0: 1.0}
+
+    stats = dist.get_statistics(bet_cost=1.0)
+    average = (3 * 0.5 + 1.5 + 10) / 8
+    variance = (3 * average**2 + 3 * (0.5 - average) ** 2 + (1.5 - average) ** 2 + (10 - average) ** 2) / 8
+    assert np.isclose(stats["average_win"], average) and np.isclose(stats["rtp"], average)
+    assert np.isclose(stats["var"], variance) and np.isclose(stats["std"], sqrt(variance))
+    assert stats["median"] == 0.5 and stats["min_diff"] == 50
+    assert stats["prob_nil"] == 3 / 8 and stats["non_zero_hr"] == 1 / (1 - 3 / 8)
+    assert stats["hr_max"] == 8 and stats["prob_less_bet"] == 6 / 8
+
+    hits, probs, rtps = dist.range_statistics([(0.1, 1), (1, 5), (20, 50)], 8, 1.0)
+    assert hits == {(0.1, 1): round(8 / 3, 3), (1, 5): 8.0, (20, 50): "NaN"}
+    assert probs[(1, 5)] == 1 / 8 and rtps[(0.1, 1)] == 1.5 / 8
+
+
+def test_baseline_statistic_types():
+    """Without a 0x payout the RGS values stay the integers 0 and 1, the last payout gap is not a min difference."""
+    dist = WinDistribution.from_dict({0.5: 2, 1.0: 1, 1.2: 1})
+    stats = dist.get_statistics(bet_cost=1.0)
+    assert stats["prob_nil"] == 0 and isinstance(stats["prob_nil"], int)
+    assert stats["non_zero_hr"] == 1 and isinstance(stats["non_zero_hr"], int)
+    assert stats["min_diff"] == 50
+
+    _, probs, rtps = dist.range_statistics([(0.1, 1), (20, 50)], 4, 1.0)
+    assert isinstance(probs[(20, 50)], int) and isinstance(rtps[(20, 50)], int)
@@ -0,0 +1,42 @@
+"""Test that compact boards (config.compact_board) produce the same books as boards of Symbol objects."""
+
+from copy import copy
+import importlib
+import os
+import sys
+import pytest
+from src.config import output_filenames
+from src.config.paths import PATH_TO_GAMES
+
+GAME_MODULES = ["gamestate", "game_config", "game_override", "game_executables", "game_calculations", "game_events"]
+
+
+@pytest.fixture(params=["0_0_lines", "0_0_ways"])
+def game(request, tmp_path, monkeypatch):
+    """GameState and GameConfig classes of a lines and a ways game, outputs are written below tmp_path."""
+    monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", str(tmp_path))
+    monkeypatch.syspath_prepend(os.path.join(PATH_TO_GAMES, request.param))
+    for module in GAME_MODULES:
+        sys.modules.pop(module, None)
+    yield importlib.import_module("gamestate").GameState, importlib.import_module("game_config").GameConfig
+    for module in GAME_MODULES:
+        sys.modules.pop(module, None)
+
+
+def test_compact_board_books_match(game):
+    """Basegame and freegame books are identical, plain symbols are shared and special symbols are not."""
+    game_state, game_config = game
+    config = game_config()
+    compact_config = copy(config)
+    compact_config.compact_board = True
+    default, compact = game_state(config), game_state(compact_config)
+    for criteria in ("basegame", "freegame"):
+        for sim in range(100):
+            assert default.replay_sim("base", sim, criteria) == compact.replay_sim("base", sim, criteria)
+
+    compact.create_board_reelstrips()
+    assert compact.get_board_ids() == [[compact.symbol_encoder.ids[sym.name] for sym in reel] for reel in compact.board]
+    for reel in compact.board:
+        for sym in reel:
+            shared = sym is compact.symbol_storage.symbols[sym.name]
+            assert shared != (sym.special or sym.name in compact.special_symbol_functions)
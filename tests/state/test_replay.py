@@ -0,0 +1,58 @@
+"""Test that single simulations replay identically to the books of a multi-threaded create_books run, and that
+outputs do not depend on the thread and scheduler layout."""
+
+import importlib
+import os
+import sys
+import pytest
+from src.config import output_filenames
+from src.config.paths import PATH_TO_GAMES
+from src.state.run_sims import create_books, replay_book
+from src.write_data.book_writer import BookReader
+
+GAME_MODULES = ["gamestate", "game_config", "game_override", "game_executables", "game_calculations", "game_events"]
+
+
+@pytest.fixture
+def cluster_game(tmp_path, monkeypatch):
+    """0_0_cluster GameState and GameConfig classes, outputs are written below tmp_path."""
+    monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", str(tmp_path))
+    monkeypatch.syspath_prepend(os.path.join(PATH_TO_GAMES, "0_0_cluster"))
+    for module in GAME_MODULES:
+        sys.modules.pop(module, None)
+    yield importlib.import_module("gamestate").GameState, importlib.import_module("game_config").GameConfig
+    for module in GAME_MODULES:
+        sys.modules.pop(module, None)
+
+
+def test_replay_matches_multi_thread_books(cluster_game, capsys):
+    """Every book is regenerated on its own, grid multipliers left by a previous freegame do not carry over."""
+    game_state, game_config = cluster_game
+    config = game_config()
+    num_sims = 200
+    create_books(game_state(config), config, {"base": num_sims}, 25, 2, True, False)
+    capsys.readouterr()
+
+    gamestate = game_state(config)
+    books = BookReader(gamestate.output_files.get_final_book_name("base", True))
+    for book in books.iter_books():
+        assert book == replay_book(gamestate, "base", num_sims, book["id"])
+
+
+def test_outputs_match_across_layouts(cluster_game, capsys):
+    """Event examples and force options written by a dynamic two thread run match a single thread run."""
+    game_state, game_config = cluster_game
+    outputs = []
+    for threads, batch_size, scheduler in [(1, 200, "static"), (2, 25, "dynamic")]:
+        config = game_config()
+        gamestate = game_state(config)
+        create_books(gamestate, config, {"base": 200}, batch_size, threads, True, False, scheduler=scheduler)
+        capsys.readouterr()
+        files = [
+            os.path.join(gamestate.output_files.config_path, "event_config_base.json"),
+            os.path.join(gamestate.output_files.force_path, "force.json"),
+        ]
+        outputs.append([open(file, encoding="UTF-8").read() for file in files])
+        for file in files:
+            os.remove(file)
+    assert outputs[0] == outputs[1]
@@ -1,5 +1,6 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
@@ -99,3 +100,21 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_iterative_clusters_match_recursive(gamestate):
+    """Iterative cluster search returns the same clusters, in the same order, as the recursive search."""
+    rng = random.Random(11)
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(["H1", "H2", "WM", "X"]))
+        assert Cluster.get_clusters(gamestate.board) == Cluster.get_clusters_recursive(gamestate.board)
+
+
+def test_large_cluster(gamestate):
+    """Clusters larger than the recursion limit are found."""
+    board = [[gamestate.create_symbol("H1") for _ in range(40)] for _ in range(40)]
+    board[0][0] = gamestate.create_symbol("WM")
+    clusters = Cluster.get_clusters(board)
+    assert len(clusters["H1"]) == 1 and len(clusters["H1"][0]) == 40 * 40
@@ -0,0 +1,58 @@
+"""Test that book events are new records, independent of the game state they were built from."""
+
+import json
+from types import SimpleNamespace
+from src.events.events import get_board_encoder, json_ready_sym, reveal_event, win_info_event
+from src.state.books import Book
+from src.write_data.book_serializer import JSONFragment, dumps_book
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+
+
+def test_win_info_event_is_independent():
+    """Padding offsets and cent conversion are applied to the event only, later state changes do not leak in."""
+    win = {
+        "symbol": "H1",
+        "win": 2.5,
+        "positions": [{"reel": 0, "row": 1}],
+        "meta": {"globalMult": 1, "winWithoutMult": 2.5, "overlay": {"reel": 0, "row": 1}},
+    }
+    gamestate = SimpleNamespace(
+        book=Book(1, "basegame"),
+        config=SimpleNamespace(wincap=5000),
+        win_data={"totalWin": 2.5, "wins": [win]},
+        write_books=True,
+    )
+    win_info_event(gamestate)
+    win["positions"][0]["row"] = 3
+    win["meta"]["overlay"]["row"] = 3
+
+    event = gamestate.book.events[0]
+    assert event["totalWin"] == 250
+    assert event["wins"][0]["win"] == 250 and event["wins"][0]["positions"] == [{"reel": 0, "row": 2}]
+    assert event["wins"][0]["meta"] == {"globalMult": 1, "winWithoutMult": 250, "overlay": {"reel": 0, "row": 2}}
+    assert win["win"] == 2.5 and win["meta"]["winWithoutMult"] == 2.5
+
+
+def test_reveal_board_encoding():
+    """Cached and pre-encoded reveal boards match json_ready_sym() of every symbol, stateful symbols are not shared."""
+    gamestate = create_test_lines_gamestate()
+    gamestate.config.include_padding = False
+    names = ["H1", "W", "M", "X", "H1"]
+    gamestate.board = [[gamestate.create_symbol(names[(reel + row) % 5]) for row in range(5)] for reel in range(5)]
+    gamestate.board[0][2].assign_attribute({"multiplier": 5})
+    special_attributes = list(gamestate.config.special_symbols.keys())
+    expected = [[json_ready_sym(symbol, special_attributes) for symbol in column] for column in gamestate.board]
+
+    encoder = get_board_encoder(gamestate)
+    board = encoder.encode_board(gamestate)
+    assert board == expected and board[0][2] == {"name": "M", "multiplier": 5}
+    assert board[0][4] is board[1][3] and board[1][1] is not board[2][0]
+    assert json.dumps(board) == encoder.encode_board_fragment(gamestate).json
+
+    gamestate.book, gamestate.gametype, gamestate.write_books = Book(1, "basegame"), "basegame", True
+    gamestate.reel_positions, gamestate.anticipation = [0] * 5, [0] * 5
+    gamestate.config.encoded_boards = True
+    reveal_event(gamestate)
+    event = gamestate.book.events[0]
+    assert isinstance(event["board"], JSONFragment) and event["board"] == expected
+    assert json.loads(dumps_book(event)) == {**event, "board": expected}
@@ -1,8 +1,10 @@
 """Test basic lines-calculation functionality."""
 
+import random
+import numpy as np
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
-from src.calculations.lines import Lines
+from src.calculations.lines import Lines, CompiledLines
 
 
 class GameLinesConfig:
@@ -122,3 +124,29 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_compiled_lines_match(gamestate):
+    """Compiled (array) lines evaluation returns the same wins as the reference implementation."""
+    compiled = CompiledLines(gamestate.config, gamestate.symbol_encoder)
+    rng = random.Random(7)
+    names = ["W", "H1", "WM", "X", "M"]
+    boards = []
+    for _ in range(200):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(names))
+        boards.append(gamestate.symbol_encoder.encode_board(gamestate.board))
+        for method in ["symbol", "global"]:
+            expected = Lines.get_lines(gamestate.board, gamestate.config, multiplier_method=method, global_multiplier=2)
+            windata = compiled.get_lines(gamestate.board, multiplier_method=method, global_multiplier=2)
+            assert windata == expected
+            windata = compiled.get_lines(
+                gamestate.board, multiplier_method=method, global_multiplier=2, board_ids=boards[-1].tolist()
+            )
+            assert windata == expected
+
+    _, _, batch_win = compiled.evaluate_batch(np.stack(boards))
+    for board_ids, board_win in zip(boards, batch_win):
+        _, _, single_win = compiled.evaluate_batch(board_ids[None, ...])
+        assert np.array_equal(single_win[0], board_win)
@@ -0,0 +1,70 @@
+"""Test symbol prototypes and cloned symbol state."""
+
+import pickle
+from src.calculations.symbol import SymbolStorage
+from src.events.events import json_ready_sym
+
+
+class GameSymbolConfig:
+    """Minimal configuration for symbol construction."""
+
+    def __init__(self):
+        self.paytable = {(3, "W"): 10, (3, "H1"): 5}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"]}
+
+
+def test_cloned_symbols_match_constructor():
+    """Cloned symbols carry the same attributes as the prototype."""
+    storage = SymbolStorage(GameSymbolConfig(), ["W", "H1", "S"])
+    wild = storage.create_symbol_state("W")
+    assert wild.special and wild.is_paying
+    assert wild.check_attribute("wild") and wild.check_attribute("multiplier")
+    assert not wild.check_attribute("scatter")
+    assert not storage.create_symbol_state("H1").special
+    assert storage.create_symbol_state("S").paytable is None
+
+
+def test_clone_attributes_are_independent():
+    """Attributes assigned to one symbol do not leak into the prototype or other symbols."""
+    storage = SymbolStorage(GameSymbolConfig(), ["W", "H1", "S"])
+    sym1 = storage.create_symbol_state("W")
+    sym2 = storage.create_symbol_state("W")
+    sym1.assign_attribute({"multiplier": 3, "custom": 1})
+    sym1.register_special_function(print)
+    assert sym1.get_attribute("multiplier") == 3 and sym1.custom == 1
+    assert sym2.get_attribute("multiplier") is True
+    assert not sym2.check_attribute("custom")
+    assert sym2.special_functions == [] and storage.symbols["W"].special_functions == []
+
+    special_attributes = ["wild", "scatter", "multiplier"]
+    assert json_ready_sym(sym1, special_attributes) == {"name": "W", "wild": True, "multiplier": 3}
+    assert json_ready_sym(storage.create_symbol_state("H1"), special_attributes) == {"name": "H1"}
+
+
+def test_json_keys_follow_assignment_order():
+    """Special attributes are emitted in the order they were assigned, not in the order of special_attributes."""
+    storage = SymbolStorage(GameSymbolConfig(), ["W", "H1", "S"])
+    scatter = storage.create_symbol_state("S")
+    scatter.assign_attribute({"prize": 5})
+    wild = storage.create_symbol_state("W")
+    wild.assign_attribute({"prize": 3, "custom": 1})
+    wild.multiplier = 2
+
+    special_attributes = ["prize", "multiplier", "scatter", "wild", "custom"]
+    assert list(json_ready_sym(scatter, special_attributes)) == ["name", "scatter", "prize"]
+    wild_keys = ["name", "wild", "multiplier", "prize", "custom"]
+    assert list(json_ready_sym(wild, special_attributes)) == wild_keys
+    assert list(json_ready_sym(wild.clone(), special_attributes)) == wild_keys
+    assert list(json_ready_sym(pickle.loads(pickle.dumps(wild)), special_attributes)) == wild_keys
+
+
+def test_unassigned_slots_read_false():
+    """The fixed attribute set is slotted, unassigned attributes read as False and are not emitted."""
+    storage = SymbolStorage(GameSymbolConfig(), ["W", "H1", "S"])
+    low = storage.create_symbol_state("H1")
+    assert "prize" not in vars(low) and low.get_attribute("prize") is False
+    assert not low.check_attribute("wild", "prize", "custom")
+    low.assign_attribute({"prize": 0})
+    assert low.check_attribute("prize")
+    low.assign_attribute({"prize": 5})
+    assert json_ready_sym(low, ["prize"]) == {"name": "H1", "prize": 5}
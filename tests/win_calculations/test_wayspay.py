@@ -1,8 +1,10 @@
 """Test basic ways-calculation functionality."""
 
+import random
+import numpy as np
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
-from src.calculations.ways import Ways
+from src.calculations.ways import Ways, CompiledWays
 
 
 class GameWaysConfig:
@@ -136,3 +138,30 @@ def test_global_multiplier_strategy(gamestate):
     expected_win = base_win * global_mult
 
     assert windata["totalWin"] == expected_win, f"Expected {expected_win}, got {windata['totalWin']}"
+
+
+@pytest.mark.parametrize("strategy", ["symbol", "board", "global"])
+def test_compiled_ways_match(gamestate, strategy):
+    """Batched ways totals equal the reference calculation for each multiplier strategy."""
+    compiled = CompiledWays(gamestate.config, gamestate.symbol_encoder)
+    rng = random.Random(3)
+    boards, multipliers, expected = [], [], []
+    for _ in range(300):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                sym = gamestate.create_symbol(rng.choice(["H1", "H2", "W", "X"]))
+                if sym.name in ["W", "H1"] and rng.random() < 0.3:
+                    setattr(sym, "multiplier", rng.choice([2, 3, 5]))
+                gamestate.board[idx][idy] = sym
+        boards.append(gamestate.symbol_encoder.encode_board(gamestate.board))
+        multipliers.append(CompiledWays.get_multiplier_array(gamestate.board))
+        windata = Ways.get_ways_data(
+            gamestate.config, gamestate.board, multiplier_strategy=strategy, global_multiplier=3
+        )
+        expected.append(windata["totalWin"])
+
+    total_wins = compiled.evaluate_batch(
+        np.stack(boards), np.stack(multipliers), multiplier_strategy=strategy, global_multiplier=3
+    )
+    assert sum(expected) > 0
+    assert total_wins == pytest.approx(expected)
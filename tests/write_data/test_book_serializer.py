@@ -0,0 +1,80 @@
+"""Test that all book serialisers write identical bytes."""
+
+import json
+import pickle
+import pytest
+from src.write_data.book_serializer import (
+    BOOK_SERIALIZERS,
+    MSGSPEC_AVAILABLE,
+    ORJSON_AVAILABLE,
+    JSONFragment,
+    JSONSerializer,
+    get_book_serializer,
+)
+from src.write_data.book_writer import BookWriter
+
+INSTALLED = {"orjson": ORJSON_AVAILABLE, "msgspec": MSGSPEC_AVAILABLE, "json": True}
+AVAILABLE = [name for name in BOOK_SERIALIZERS if INSTALLED[name]]
+
+
+AWKWARD_VALUES = {
+    "exponent floats": {"baseGameWins": 1e-05, "freeGameWins": 1e16},
+    "integer keys": {"meta": {3: None}},
+    "non-finite floats": {"baseGameWins": float("nan"), "freeGameWins": float("inf"), "meta": {"cap": float("-inf")}},
+}
+
+
+def make_book(board: object, awkward: str = None) -> dict:
+    """Book with non-ASCII text, awkward books also contain one kind of value fast serialisers write differently."""
+    values = AWKWARD_VALUES.get(awkward, {})
+    meta = values.get("meta", {})
+    return {
+        "id": 1,
+        "payoutMultiplier": 250,
+        "events": [
+            {"index": 0, "type": "reveal", "board": board},
+            {"index": 1, "type": "winInfo", "wins": [{"symbol": "Gölden", "win": 2.5, "meta": meta}]},
+        ],
+        "criteria": "basegame",
+        "baseGameWins": values.get("baseGameWins", 0.30000000000000004),
+        "freeGameWins": values.get("freeGameWins", 0.0),
+    }
+
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_compact_serializers_identical(name):
+    """Every installed serialiser matches compact json.dumps() output, including fragments, and survives pickling."""
+    serializer = pickle.loads(pickle.dumps(get_book_serializer(name, compact=True)))
+    assert serializer.name == name
+    board = [[{"name": "L1"}, {"name": "W", "wild": True}]]
+    fragment = JSONFragment(json.dumps(board, separators=(",", ":")))
+    for awkward in [None, *AWKWARD_VALUES]:
+        expected = json.dumps(make_book(board, awkward), separators=(",", ":"), ensure_ascii=False)
+        assert serializer.encode(make_book(fragment, awkward)) == expected.encode("UTF-8")
+    assert serializer.encode({"id": 3, "baseGameWins": 1.5}) == b'{"id":3,"baseGameWins":1.5}'
+
+
+def test_default_format_uses_json(tmp_path):
+    """Default books keep the json.dumps() format, fast serialisers are only used for compact books."""
+    assert get_book_serializer("auto").name == "json" and not get_book_serializer("json").compact
+    with pytest.warns(UserWarning):
+        assert get_book_serializer("orjson").name == "json"
+    with pytest.raises(ValueError):
+        get_book_serializer("ujson")
+
+    book = {"id": 1, "payoutMultiplier": 0, "events": [], "criteria": "0", "baseGameWins": 0.0, "freeGameWins": 0.0}
+    book_name = str(tmp_path / "books.json")
+    with BookWriter(str(tmp_path / "lut"), str(tmp_path / "seg"), book_name, regular_json=True) as writer:
+        writer.write_book(book)
+        writer.write_book({**book, "id": 2})
+    with open(book_name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps([book, {**book, "id": 2}])
+
+    book_name = str(tmp_path / "books_compact.json")
+    serializer = get_book_serializer("auto", compact=True)
+    with BookWriter(str(tmp_path / "lut"), str(tmp_path / "seg"), book_name, True, serializer=serializer) as writer:
+        writer.write_book(book)
+        writer.write_book({**book, "id": 2})
+    with open(book_name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps([book, {**book, "id": 2}], separators=(",", ":"))
+    assert JSONSerializer().encode({"a": "é"}) == b'{"a": "\\u00e9"}'
@@ -0,0 +1,124 @@
+"""Test incremental book writing and merging of compressed book files."""
+
+import json
+import shutil
+import pytest
+import zstandard as zstd
+from src.write_data.book_writer import (
+    BookReader,
+    BookWriter,
+    get_dictionary_name,
+    merge_book_indexes,
+    recompress_file,
+    train_book_dictionary,
+)
+from utils.rgs_verification import verify_book_index, verify_books_and_payout_mults
+
+
+def make_book(book_id: int, payout: int) -> dict:
+    """Minimal JSON-ready book."""
+    return {
+        "id": book_id,
+        "payoutMultiplier": payout,
+        "events": [{"index": 0, "type": "reveal"}],
+        "criteria": "basegame",
+        "baseGameWins": payout / 100,
+        "freeGameWins": 0.0,
+    }
+
+
+def write_books(tmp_path, name: str, books: list, **kwargs) -> str:
+    """Write books with a BookWriter, returns the book file path."""
+    book_name = str(tmp_path / name)
+    with BookWriter(str(tmp_path / f"{name}.lut"), str(tmp_path / f"{name}.seg"), book_name, **kwargs) as writer:
+        for book in books:
+            writer.write_book(book)
+    return book_name
+
+
+def test_book_writer_outputs(tmp_path):
+    """Books, lookup and pay-split rows are written in the same format as the batch writers."""
+    books = [make_book(1, 0), make_book(2, 250)]
+    book_name = write_books(tmp_path, "books.jsonl.zst", books, keep_event_examples=True)
+    with open(book_name, "rb") as f:
+        lines = zstd.ZstdDecompressor().stream_reader(f).read().decode("UTF-8").splitlines()
+    assert [json.loads(line) for line in lines] == books
+    assert (tmp_path / "books.jsonl.zst.lut").read_text() == "1,1,0\n2,1,250\n"
+    assert (tmp_path / "books.jsonl.zst.seg").read_text() == "1,basegame,0.0,0.0\n2,basegame,2.5,0.0\n"
+
+    json_name = write_books(tmp_path, "books.json", books, regular_json=True)
+    with open(json_name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps(books)
+
+
+def test_concatenated_frames_verify(tmp_path):
+    """Books merged by appending compressed frames are read back completely."""
+    first = write_books(tmp_path, "books_0.jsonl.zst", [make_book(1, 0), make_book(2, 120)])
+    second = write_books(
+        tmp_path, "books_1.jsonl.zst", [make_book(3, 40)], compression_level=10, window_log=24, long_distance=True
+    )
+    merged = tmp_path / "books_base.jsonl.zst"
+    with open(merged, "wb") as f_out:
+        for name in [first, second]:
+            with open(name, "rb") as f_in:
+                shutil.copyfileobj(f_in, f_out)
+
+    payouts, num_events = verify_books_and_payout_mults(str(merged))
+    assert payouts == [0, 120, 40]
+    assert num_events == 3
+
+
+def test_book_writer_stats(tmp_path):
+    """Reported raw size matches the decompressed book file."""
+    books = [make_book(idx, 10 * idx) for idx in range(1, 50)]
+    book_name = str(tmp_path / "books.jsonl.zst")
+    with BookWriter(str(tmp_path / "lut"), str(tmp_path / "seg"), book_name, long_distance=True) as writer:
+        for book in books:
+            writer.write_book(book)
+    with open(book_name, "rb") as f:
+        raw = zstd.ZstdDecompressor().stream_reader(f).read()
+    stats = writer.get_stats()
+    assert stats["books"] == len(books)
+    assert stats["raw_bytes"] == len(raw)
+
+
+def test_dictionary_books_verify(tmp_path):
+    """Books compressed with a trained dictionary are read back using the dictionary stored next to them."""
+    sample = write_books(tmp_path, "books_sample.jsonl.zst", [make_book(idx, idx % 7) for idx in range(1, 2001)])
+    book_name = str(tmp_path / "books_base.jsonl.zst")
+    dictionary = train_book_dictionary([sample], get_dictionary_name(book_name), dict_size=4096)
+    assert dictionary is not None
+    assert get_dictionary_name(book_name) == str(tmp_path / "books_base.dict")
+
+    books = [make_book(idx, 10 * idx) for idx in range(1, 6)]
+    write_books(tmp_path, "books_base.jsonl.zst", books, dictionary=dictionary)
+    with open(book_name, "rb") as f:
+        assert zstd.get_frame_parameters(f.read(18)).dict_id == dictionary.dict_id()
+    payouts, num_events = verify_books_and_payout_mults(book_name)
+    assert payouts == [book["payoutMultiplier"] for book in books]
+    assert num_events == len(books)
+
+
+def test_indexed_frames_random_access(tmp_path):
+    """Books split into indexed frames are fetched by id from merged files, also after re-compression."""
+    first = write_books(tmp_path, "books_0.jsonl.zst", [make_book(idx, idx) for idx in range(1, 13)], frame_books=4)
+    second = write_books(tmp_path, "books_1.jsonl.zst", [make_book(idx, idx) for idx in range(13, 20)], frame_books=4)
+    recompress_file(second, zstd.ZstdCompressor(level=10))
+    merged = str(tmp_path / "books_base.jsonl.zst")
+    with open(merged, "wb") as f_out:
+        for name in [first, second]:
+            with open(name, "rb") as f_in:
+                shutil.copyfileobj(f_in, f_out)
+    assert merge_book_indexes([first, second], merged)
+
+    with BookReader(merged) as reader:
+        assert [frame[:2] for frame in reader.frames] == [[1, 4], [5, 4], [9, 4], [13, 4], [17, 3]]
+        assert reader.num_books == 19
+        assert reader.get_book(10) == make_book(10, 10)
+        assert reader.get_book(19) == make_book(19, 19)
+        assert [book["id"] for book in reader.iter_books()] == list(range(1, 20))
+        with pytest.raises(KeyError):
+            reader.get_book(20)
+    payouts, _ = verify_books_and_payout_mults(merged)
+    assert payouts == list(range(1, 20))
+    verify_book_index(merged, len(payouts))
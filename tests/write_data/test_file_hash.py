@@ -0,0 +1,59 @@
+"""Test hashes recorded while writing output files."""
+
+import hashlib
+import os
+import pytest
+from src.write_data import file_hash
+from src.write_data.file_hash import (
+    HashedFile,
+    concatenate_files,
+    get_file_sha256,
+    get_manifest_name,
+    read_manifest,
+)
+
+
+def read_sha256(file_name: str) -> str:
+    """Hash of the file contents on disk."""
+    with open(file_name, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_hash_while_writing(tmp_path):
+    """Written and concatenated files record the hash of their bytes, modified files are re-hashed."""
+    parts = []
+    for idx, data in enumerate([b"1,1,0\n", b"", b"2,1,250\n" * 1000]):
+        parts.append(str(tmp_path / f"part_{idx}.csv"))
+        with HashedFile(parts[-1]) as f:
+            f.write(data)
+        assert get_file_sha256(parts[-1]) == read_sha256(parts[-1])
+
+    out_name = str(tmp_path / "combined.csv")
+    sha = concatenate_files(parts, out_name)
+    assert sha == get_file_sha256(out_name) == read_sha256(out_name)
+
+    with open(out_name, "ab") as f:
+        f.write(b"3,1,0\n")
+    stat = os.stat(out_name)
+    os.utime(out_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_file_sha256(out_name) == read_sha256(out_name) != sha
+
+
+def test_manifest_hash_reused(tmp_path, monkeypatch):
+    """Hashes persisted in the sidecar manifest are used by later processes while the file is unchanged."""
+    file_name = str(tmp_path / "books_base.jsonl.zst")
+    with HashedFile(file_name) as f:
+        f.write(b"book bytes")
+    manifest_name = get_manifest_name(file_name)
+    assert read_manifest(manifest_name)["books_base.jsonl.zst"]["sha256"] == read_sha256(file_name)
+
+    file_hash._file_hashes.clear()
+    monkeypatch.setattr(file_hash, "hash_file", lambda name: pytest.fail(f"{name} was re-read"))
+    assert get_file_sha256(file_name) == read_sha256(file_name)
+
+    monkeypatch.undo()
+    file_hash._file_hashes.clear()
+    with open(file_name, "wb") as f:
+        f.write(b"optimized bytes")
+    assert get_file_sha256(file_name) == read_sha256(file_name)
+    assert read_manifest(manifest_name)["books_base.jsonl.zst"]["sha256"] == read_sha256(file_name)
@@ -0,0 +1,46 @@
+"""Test binary temporary force records and their merge."""
+
+from array import array
+from types import SimpleNamespace
+import numpy as np
+from src.write_data.force_index import ForceIndex
+from src.write_data.write_data import merge_recorded_wins, print_recorded_wins
+
+FREESPIN = (("gametype", "basegame"), ("kind", "3"), ("symbol", "S"))
+WINCAP = (("gametype", "freegame"), ("symbol", "wincap"))
+
+
+def write_batch(tmp_path, name: str, recorded_events: dict) -> str:
+    """Write the recorded events of a single batch."""
+    fname = str(tmp_path / name)
+    events = {key: array("I", ids) for key, ids in recorded_events.items()}
+    print_recorded_wins(SimpleNamespace(recorded_events=events), fname)
+    return fname
+
+
+def test_merge_recorded_wins(tmp_path):
+    """Descriptions keep their order of first appearance and book ids keep the batch order."""
+    files = [
+        write_batch(tmp_path, "force_0.npz", {FREESPIN: [2, 7]}),
+        write_batch(tmp_path, "force_1.npz", {}),
+        write_batch(tmp_path, "force_2.npz", {WINCAP: [11], FREESPIN: [12, 15]}),
+    ]
+    merged = merge_recorded_wins(files)
+    assert [description for description, _ in merged] == [FREESPIN, WINCAP]
+    assert [book_ids.tolist() for _, book_ids in merged] == [[2, 7, 12, 15], [11]]
+    assert merge_recorded_wins(files[1:2]) == []
+
+
+def test_force_index_queries(tmp_path):
+    """Sparse (id array) and dense (bitset) descriptions give the same query results after saving."""
+    recorded_wins = [(FREESPIN, np.arange(1, 101, 2, dtype=np.uint32)), (WINCAP, np.array([4, 9], dtype=np.uint32))]
+    payouts = np.arange(100) * 10
+    ForceIndex.from_recorded_wins(recorded_wins, payouts).save(str(tmp_path / "force_index_base.npz"))
+    index = ForceIndex.load(str(tmp_path / "force_index_base.npz"))
+    assert index.containers[0].dtype == bool and index.containers[1].dtype == np.uint32
+
+    assert index.where(symbol="S").ids().tolist() == list(range(1, 101, 2))
+    assert index.where(symbol="S", gametype="freegame").ids().tolist() == []
+    assert (index.where(symbol="wincap") | index.where(kind=3)).ids().tolist()[:4] == [1, 3, 4, 5]
+    assert (index.payout_range(20, 100) & ~index.where(kind=3)).ids().tolist() == [4, 6, 8, 10]
+    assert len(index.all_books()) == 100
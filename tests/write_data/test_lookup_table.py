@@ -0,0 +1,39 @@
+"""Test binary lookup-table companions and their loader."""
+
+import os
+import numpy as np
+import pytest
+from src.write_data.lookup_table import get_binary_lookup_name, load_lookup_table, write_binary_lookup
+
+
+def write_csv(tmp_path, rows: list) -> str:
+    """Write an id,weight,payout lookup table."""
+    fname = str(tmp_path / "lookUpTable_base_0.csv")
+    with open(fname, "w", encoding="UTF-8") as f:
+        f.writelines("{},{},{}\n".format(*row) for row in rows)
+    return fname
+
+
+def test_binary_lookup_matches_csv(tmp_path):
+    """The memory-mapped companion holds the csv values, a newer csv takes precedence over a stale companion."""
+    lut_file = write_csv(tmp_path, [(1, 1, 0), (2, 2**40, 120), (3, 5, 2**35)])
+    parsed = load_lookup_table(lut_file)
+    write_binary_lookup(lut_file)
+    mapped = load_lookup_table(lut_file)
+    assert isinstance(mapped, np.memmap)
+    assert np.array_equal(parsed, mapped)
+    assert mapped["weight"].tolist() == [1, 2**40, 5] and mapped["payout"].tolist() == [0, 120, 2**35]
+
+    write_csv(tmp_path, [(1, 3, 10.0)])
+    binary_time = os.path.getmtime(get_binary_lookup_name(lut_file))
+    os.utime(lut_file, (binary_time + 1, binary_time + 1))
+    reloaded = load_lookup_table(lut_file)
+    assert not isinstance(reloaded, np.memmap)
+    assert reloaded.tolist() == [(1, 3, 10)]
+
+
+def test_negative_lookup_values_rejected(tmp_path):
+    """Negative weights or payouts are rejected, whether written as integers or floats."""
+    for row in [(1, -1, 0), (1, 1, -5.0)]:
+        with pytest.raises(ValueError):
+            load_lookup_table(write_csv(tmp_path, [(2, 1, 0), row]))
@@ -3,10 +3,13 @@
 import os
 import sys
 import json
-import hashlib
 import warnings
 import threading
+import numpy as np
 from botocore.exceptions import NoCredentialsError
+from src.write_data.book_writer import get_dictionary_name
+from src.write_data.file_hash import get_file_sha256
+from src.write_data.lookup_table import load_lookup_table
 
 
 class check_files:
@@ -24,19 +27,8 @@ class check_files:
         return book_count
 
     def get_lut_sha(self, lut_base_path, target_file):
-        """Compare hash of lookup tables."""
-        file_to_hash = lut_base_path + target_file
-        with open(file_to_hash, "rb") as f:
-            sha256_file = hashlib.sha256()
-            while True:
-                data = f.read(65536)
-                if not data:
-                    break
-                sha256_file.update(data)
-
-        sha256_hexRep = sha256_file.hexdigest()
-
-        return sha256_hexRep
+        """Compare hash of lookup tables, recorded when the file was written if it has not changed since."""
+        return get_file_sha256(lut_base_path + target_file)
 
     def file_checker(self):
         """Return valid game modes from config."""
@@ -117,22 +109,11 @@ class FileDetails:
 
     def get_win_weights(self, fname):
         """Return sorted win distribution."""
-        file = open(fname, "r")
-        winDict = {}
-        total_weight = 0
-        for line in file:
-            _, weight, win = line.split(",")
-            try:
-                winDict[float(win) / 100] += float(weight)
-            except:
-                winDict[float(win) / 100] = float(weight)
-            total_weight += float(weight)
+        lookup = load_lookup_table(fname)
+        wins, win_index = np.unique(lookup["payout"], return_inverse=True)
+        weights = np.bincount(win_index, weights=lookup["weight"].astype(np.float64), minlength=len(wins))
 
-        sorted_wins = list(winDict.keys())
-        sorted_wins.sort()
-        sortedWeights = [winDict[win] for win in sorted_wins]
-
-        return sorted_wins, sortedWeights
+        return (wins / 100).tolist(), weights.tolist()
 
     def get_file_paths(self, books=True, config_files=True, lookupTables=True, force_files=True):
         """Get all file upload paths and check existence."""
@@ -163,6 +144,15 @@ class FileDetails:
                     )
                 except FileNotFoundError:
                     print("Book Upload Error!")
+                dict_f_name = get_dictionary_name(all_file_paths[books_name])
+                if os.path.exists(dict_f_name):
+                    warnings.warn(
+                        f"Books of mode '{mode}' are compressed with a trained zstd dictionary (experimental "
+                        f"config.zstd_dictionary). They can only be decompressed together with {dict_f_name}, "
+                        "which is uploaded as well. Re-run the simulation without zstd_dictionary unless the "
+                        "RGS reads dictionary compressed books."
+                    )
+                    all_file_paths[mode + "_books_dict"] = dict_f_name
             if lookupTables:
                 lut_f_name = os.path.join(gamePath, "publish_files", "lookUpTable_" + mode + "_0.csv")
                 if os.path.exists(lut_f_name):
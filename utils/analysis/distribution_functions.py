@@ -1,6 +1,116 @@
-from collections import defaultdict
 from math import sqrt
 import numpy as np
+from src.write_data.lookup_table import load_lookup_table
+
+
+class WinDistribution:
+    """Sorted unique payouts (bet multiples) and their summed weights, all RGS statistics use numpy arrays."""
+
+    def __init__(self, payouts, weights):
+        order = np.argsort(np.asarray(payouts, dtype=np.float64), kind="stable")
+        self.payouts = np.asarray(payouts, dtype=np.float64)[order]
+        self.weights = np.asarray(weights, dtype=np.float64)[order]
+        self.total_weight = float(self.weights.sum())
+        self.probs = self.weights / self.total_weight
+
+    @classmethod
+    def from_lookup(cls, lookup: np.ndarray) -> "WinDistribution":
+        """Combine the rows of a structured lookup table (see load_lookup_table) by payout."""
+        payouts, inverse = np.unique(lookup["payout"], return_inverse=True)
+        weights = np.bincount(inverse, weights=lookup["weight"].astype(np.float64), minlength=len(payouts))
+        return cls(payouts / 100, weights)
+
+    @classmethod
+    def from_dict(cls, dist: dict) -> "WinDistribution":
+        """From a {payout: weight or probability} dictionary."""
+        return cls(list(dist.keys()), list(dist.values()))
+
+    def to_dict(self, normalize: bool = True) -> dict:
+        """Ordered {payout: probability} (or {payout: weight}) dictionary."""
+        values = self.probs if normalize else self.weights
+        return dict(zip(self.payouts.tolist(), values.tolist()))
+
+    def average(self) -> float:
+        """Weighted average payout."""
+        return float(np.dot(self.payouts, self.probs))
+
+    def moments(self) -> tuple:
+        """Variance, standard deviation, skewness and excess kurtosis, the last two are 0 if all payouts match."""
+        deviations = self.payouts - self.average()
+        squared = deviations * deviations
+        variance = float(np.dot(squared, self.probs))
+        standard_dev = sqrt(variance)
+        skewness, kurtosis = 0.0, 0.0
+        if standard_dev > 0:
+            skewness = float(np.dot(squared * deviations, self.probs)) / standard_dev**3
+            kurtosis = float(np.dot(squared * squared, self.probs)) / standard_dev**4 - 3
+        return variance, standard_dev, skewness, kurtosis
+
+    def median(self) -> float:
+        """Smallest payout with a cumulative probability of at least 1/2."""
+        cumulative_weight = np.cumsum(self.weights)
+        return float(self.payouts[np.argmax(cumulative_weight >= self.total_weight / 2)])
+
+    def prob_no_win(self) -> float:
+        """Probability of a 0x payout."""
+        return float(self.probs[0]) if self.payouts[0] == 0 else 0
+
+    def non_zero_hitrate(self) -> float:
+        """Inverse probability of a non-zero payout."""
+        return 1 / (1 - self.prob_no_win()) if self.payouts[0] == 0 else 1
+
+    def maxwin_hitrate(self) -> float:
+        """Inverse probability of the largest payout."""
+        return 1 / float(self.probs[-1])
+
+    def prob_less_than(self, value: float) -> float:
+        """Probability of a payout below value."""
+        return float(self.probs[self.payouts < value].sum())
+
+    def min_difference(self) -> int:
+        """Smallest difference between consecutive payouts, in payout-multiplier cents.
+        As in the RGS check, the difference between the two largest payouts is not included."""
+        if len(self.payouts) < 3:
+            return 0
+        return int(round(float(np.diff(self.payouts)[:-1].min()) * 100))
+
+    def range_statistics(self, win_ranges: list, total_weight: float, bet_cost: float) -> tuple:
+        """Hit-rate, probability and rtp of payouts within each [low, high) win range, relative to total_weight."""
+        range_hits, range_probs, range_rtps = {}, {}, {}
+        for win_range in win_ranges:
+            in_range = (self.payouts >= win_range[0]) & (self.payouts < win_range[1])
+            weights = self.weights[in_range]
+            range_probs[win_range], range_rtps[win_range] = 0, 0
+            if in_range.any():
+                range_probs[win_range] = float(weights.sum()) / total_weight
+                range_rtps[win_range] = float(np.dot(self.payouts[in_range], weights)) / total_weight
+            if range_probs[win_range] > 0:
+                range_hits[win_range] = round(1 / range_probs[win_range], 3)
+                range_rtps[win_range] /= bet_cost
+            else:
+                range_hits[win_range] = "NaN"
+        return range_hits, range_probs, range_rtps
+
+    def get_statistics(self, bet_cost: float) -> dict:
+        """All statistics tested upon RGS upload."""
+        average = self.average()
+        variance, standard_dev, skewness, kurtosis = self.moments()
+        median = self.median()
+        return {
+            "average_win": average,
+            "rtp": average / bet_cost,
+            "var": variance,
+            "std": standard_dev,
+            "skew": skewness,
+            "excess_kurtosis": kurtosis,
+            "median": median,
+            "m2m": average / median if median > 0 else 0,
+            "min_diff": self.min_difference(),
+            "hr_max": self.maxwin_hitrate(),
+            "non_zero_hr": self.non_zero_hitrate(),
+            "prob_nil": self.prob_no_win(),
+            "prob_less_bet": self.prob_less_than(bet_cost),
+        }
 
 
 def get_lookup_length(filepath: str) -> int:
@@ -8,121 +118,56 @@ def get_lookup_length(filepath: str) -> int:
     return sum(1 for _ in open(filepath, "rb"))
 
 
-def make_win_distribution(filepath: str, normalize: bool = True) -> dict:
-    """Construct win-distribution with unique, ordered payouts."""
-    dist = defaultdict(float)
-    with open(filepath, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = int(weight)
-            payout = float(payout) / 100
-            dist[payout] += weight
+def load_win_distribution(filepath: str) -> WinDistribution:
+    """Win-distribution of a lookup table file."""
+    return WinDistribution.from_lookup(load_lookup_table(filepath))
 
-    # Sort by win amount
-    dist = dict(sorted(dist.items(), key=lambda x: x[0], reverse=False))
-    if normalize:
-        total_weight = sum(dist.values())
-        dist = {x: y / total_weight for x, y in dist.items()}
 
-    return dist
+def make_win_distribution(filepath: str, normalize: bool = True) -> dict:
+    """Construct win-distribution with unique, ordered payouts."""
+    return load_win_distribution(filepath).to_dict(normalize)
 
 
 def get_distribution_average(dist: dict) -> float:
     """Return weighted average from ordered win distribution."""
-    return np.average(list(dist.keys()), weights=list(dist.values()))
+    return WinDistribution.from_dict(dist).average()
 
 
 def get_distribution_moments(dist: dict) -> float:
     """Given a (weighted) lookup-table, return standard deviation."""
-    av_win = get_distribution_average(dist)
-    total_weight = sum(list(dist.values()))
-
-    variance = 0.0
-    for pay, weight in dist.items():
-        variance += ((pay - av_win) ** 2) * (weight / total_weight)
-    standard_dev = sqrt(variance)
-
-    skewness, kurtosis = 0.0, 0.0
-    av_win = float(av_win)
-    
-    # Only calculate skewness and kurtosis if standard_dev > 0
-    if standard_dev > 0:
-        for win, weight in dist.items():
-            skewness += ((win - av_win) ** 3) * weight
-            kurtosis += ((win - av_win) ** 4) * weight
-        skewness /= (standard_dev) ** 3
-        kurtosis /= (standard_dev) ** 4
-        kurtosis -= 3
-    # If standard_dev == 0, skewness and kurtosis remain 0.0
-
-    return variance, standard_dev, skewness, kurtosis
+    return WinDistribution.from_dict(dist).moments()
 
 
 def get_distribution_median(dist: dict, total_weight=None) -> float:
     """Return median of an ordered win-distribution."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_weight = 0
-    for win, weight in dist.items():
-        cumulative_weight += weight
-        if cumulative_weight >= total_weight / 2:
-            return win
-    return 0
+    return WinDistribution.from_dict(dist).median()
 
 
 def get_maxwin_hitrate(dist: dict, total_weight=None) -> float:
     """Return frequency of max-win."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    max_win_prob = dist[max(list(dist.keys()))] / total_weight
-    return 1.0 / max_win_prob
+    return WinDistribution.from_dict(dist).maxwin_hitrate()
 
 
 def get_prob_no_win(dist: dict, total_weight=None) -> float:
     "Probability of 0x payout amount."
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return dist[0]
-    return 0
+    return WinDistribution.from_dict(dist).prob_no_win()
 
 
 def prob_less_than_bet(dist: dict, bet_cost: float, total_weight=None):
     """Probability of winning less than mode bet cost."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_prob = 0
-    for win, weight in dist.items():
-        if win < bet_cost:
-            cumulative_prob += weight
-
-    return cumulative_prob / total_weight
+    return WinDistribution.from_dict(dist).prob_less_than(bet_cost)
 
 
 def non_zero_hitrate(dist: dict, total_weight=None):
     """Calculate probability of"""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return 1 / (1 - dist[0] / total_weight)
-    else:
-        return 1
+    return WinDistribution.from_dict(dist).non_zero_hitrate()
 
 
 def calculate_rtp(dist: dict, bet_cost: float, total_weight: float = None) -> float:
     """Get distribution RTP."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    return float(np.dot(list(dist.keys()), list(dist.values()))) / total_weight / bet_cost
+    return WinDistribution.from_dict(dist).average() / bet_cost
 
 
 def min_dist_difference(dist: dict):
     """Minimum payout amount difference"""
-    wins = list(dist.keys())
-    diff = None
-    for i in range(len(wins) - 2):
-        if diff is None or (diff > abs(wins[i + 1]) - wins[i]):
-            diff = abs(wins[i + 1]) - wins[i]
-    return int(round(diff * 100))
+    return WinDistribution.from_dict(dist).min_difference()
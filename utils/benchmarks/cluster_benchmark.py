@@ -0,0 +1,50 @@
+"""Compare iterative and recursive cluster detection on boards drawn from the 0_0_cluster reelstrips."""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "games", "0_0_cluster"))
+
+from game_config import GameConfig  # noqa: E402
+from gamestate import GameState  # noqa: E402
+from src.calculations.cluster import Cluster  # noqa: E402
+
+
+def draw_boards(gamestate: object, num_boards: int) -> list:
+    """Draw basegame boards from reelstrips."""
+    gamestate.criteria = "basegame"
+    gamestate.betmode = "base"
+    gamestate.reset_book()
+    boards = []
+    for _ in range(num_boards):
+        gamestate.create_board_reelstrips()
+        boards.append(gamestate.board)
+    return boards
+
+
+def time_function(cluster_function: callable, boards: list) -> tuple:
+    """Total time (seconds) and results of evaluating all boards."""
+    start = time.perf_counter()
+    results = [cluster_function(board, "wild") for board in boards]
+    return time.perf_counter() - start, results
+
+
+def run_benchmark(num_boards: int = 2000) -> None:
+    """Print timings for both implementations and check the returned clusters are identical."""
+    config = GameConfig()
+    boards = draw_boards(GameState(config), num_boards)
+    recursive_time, recursive_clusters = time_function(Cluster.get_clusters_recursive, boards)
+    iterative_time, iterative_clusters = time_function(Cluster.get_clusters, boards)
+    assert recursive_clusters == iterative_clusters, "cluster outputs differ"
+
+    board_size = f"{config.num_reels}x{max(config.num_rows)}"
+    print(f"{num_boards} {board_size} boards")
+    print(f"recursive: {recursive_time:.3f}s ({1e6 * recursive_time / num_boards:.1f} us/board)")
+    print(f"iterative: {iterative_time:.3f}s ({1e6 * iterative_time / num_boards:.1f} us/board)")
+    print(f"speedup: {recursive_time / iterative_time:.2f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
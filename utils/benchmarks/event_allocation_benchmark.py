@@ -0,0 +1,66 @@
+"""Compare building 0_0_cluster (tumble) books with and without the previous defensive deep copy of every event."""
+
+import os
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "games", "0_0_cluster"))
+
+from game_config import GameConfig  # noqa: E402
+from gamestate import GameState  # noqa: E402
+from src.state.books import Book  # noqa: E402
+
+copied_objects = [0]
+
+
+def copying_add_event(self, event: dict) -> None:
+    """Previous Book.add_event, every event was deep-copied before it was stored."""
+    memo = {}
+    self.events.append(deepcopy(event, memo))
+    copied_objects[0] += len(memo)
+
+
+def run_spins(gamestate: object, num_spins: int, criteria: str, trace: bool = False) -> tuple:
+    """Replay num_spins simulations, returns (seconds, peak traced bytes of a single spin, books)."""
+    books, peak, elapsed = [], 0, 0.0
+    for sim in range(num_spins):
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        books.append(gamestate.replay_sim("base", sim, criteria))
+        elapsed += time.perf_counter() - start
+        if trace:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return elapsed, peak, books
+
+
+def run_benchmark(num_spins: int = 500, criteria: str = "freegame") -> None:
+    """Print spin timings, copied objects and peak memory per spin for both versions, and check books match."""
+    gamestate = GameState(GameConfig())
+    add_event = Book.add_event
+    results = {}
+    for name, method in [("deepcopy", copying_add_event), ("copy-free", add_event)]:
+        Book.add_event = method
+        copied_objects[0] = 0
+        spin_time, _, books = run_spins(gamestate, num_spins, criteria)
+        _, peak, _ = run_spins(gamestate, min(num_spins, 100), criteria, trace=True)
+        results[name] = (spin_time, copied_objects[0], peak, books)
+    Book.add_event = add_event
+    assert results["deepcopy"][3] == results["copy-free"][3], "books differ"
+
+    num_events = sum(len(book["events"]) for book in results["copy-free"][3])
+    print(f"{num_spins} '{criteria}' spins, {num_events / num_spins:.1f} events per spin")
+    for name, (spin_time, copied, peak, _) in results.items():
+        print(
+            f"{name:>9}: {1e3 * spin_time / num_spins:.3f} ms/spin, "
+            f"{copied / num_spins:.0f} objects copied per spin, peak {peak / 1e3:.0f} kB per spin"
+        )
+    print(f"speedup: {results['deepcopy'][0] / results['copy-free'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark(*[int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]])
@@ -1,11 +1,12 @@
 """Test file decompression and validate data structure is valid JSON."""
 
 import json
-import zstandard as zstd
+from src.write_data.book_writer import get_book_decompressor
 
 
-def decompress(input_path: str, save_output: bool = False):
-    """Decompress zst files assuming newline char to indicate different sims."""
+def decompress(input_path: str, save_output: bool = False, dict_path: str = None):
+    """Decompress zst files assuming newline char to indicate different sims.
+    Uses dict_path, or the trained dictionary stored next to the book file if there is one."""
 
     def json_validate(json_blob):
         """Validate each uncompressed result to ensure valid json format."""
@@ -15,9 +16,9 @@ def decompress(input_path: str, save_output: bool = False):
             print("Invalid JSON!")
             raise RuntimeError("Invalid JSON")
 
-    decompressor = zstd.ZstdDecompressor()
+    decompressor = get_book_decompressor(input_path, dict_path)
     with open(input_path, "rb") as f:
-        with decompressor.stream_reader(f) as reader:
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             decompressed_data = reader.read().decode("utf-8")
 
     all_sims = decompressed_data.split("\n")
@@ -4,13 +4,17 @@ Script to format books files after simulation runs
 This script will format simple name objects to single lines while keeping complex objects pretty-printed
 Supports both JSON and JSONL formats
 Only processes files with "books" in their name within the games directory
+With --compressed, .jsonl.zst books (and their trained dictionary) are also decompressed into library/books/
 """
 
 import json
 import re
+import shutil
 import sys
 from pathlib import Path
 
+from src.write_data.book_writer import get_book_decompressor
+
 
 def is_valid_jsonl(content):
     """Check if content is valid JSONL format"""
@@ -164,6 +168,18 @@ def process_json_file(file_path):
         return 0
 
 
+def decompress_books_file(file_path):
+    """Decompress a .jsonl.zst books file into the library books/ folder, returns the .jsonl path"""
+    output_dir = file_path.parent.parent / "books"
+    output_dir.mkdir(exist_ok=True)
+    output_path = output_dir / file_path.name[: -len(".zst")]
+    decompressor = get_book_decompressor(str(file_path))
+    with open(file_path, "rb") as f_in, open(output_path, "wb") as f_out:
+        with decompressor.stream_reader(f_in, read_across_frames=True) as reader:
+            shutil.copyfileobj(reader, f_out)
+    return output_path
+
+
 def process_large_json_array(file_path, content):
     """Process a large JSON array stored on a single line by extracting individual objects"""
     try:
@@ -334,12 +350,13 @@ def process_large_json_array(file_path, content):
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 format_books_json.py <game_directory>")
+    args = [arg for arg in sys.argv[1:] if arg != "--compressed"]
+    if len(args) != 1:
+        print("Usage: python3 format_books_json.py <game_directory> [--compressed]")
         print("Example: python3 format_books_json.py games/0_0_tower_defense")
         sys.exit(1)
 
-    game_dir = Path(sys.argv[1])
+    game_dir = Path(args[0])
 
     if not game_dir.exists():
         print(f"Error: Game directory '{game_dir}' does not exist")
@@ -347,6 +364,11 @@ def main():
 
     # Find all .json and .jsonl files with "books" in their name in the game directory
     json_files = [f for f in game_dir.glob("**/*.json") if "books" in f.name.lower()]
+    if "--compressed" in sys.argv[1:]:
+        for f in game_dir.glob("**/*.jsonl.zst"):
+            if "books" in f.name.lower():
+                print(f"  Decompressing: {f}")
+                decompress_books_file(f)
     jsonl_files = [f for f in game_dir.glob("**/*.jsonl") if "books" in f.name.lower()]
     all_files = json_files + jsonl_files
 
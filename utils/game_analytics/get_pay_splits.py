@@ -1,22 +1,20 @@
 from src.config.paths import PATH_TO_GAMES
 from collections import defaultdict
 import os
+import numpy as np
+from src.write_data.lookup_table import load_lookup_table
+from utils.analysis.distribution_functions import WinDistribution
 
 
 def get_unoptimized_hits(lut_path, all_modes, win_ranges):
     """Calculate hit-rates of simulation output lookup table."""
-    all_modes_base_dist = defaultdict(lambda: defaultdict(int))
+    all_modes_base_dist = {}
     total_mode_count = {}
     for mode in all_modes:
         base_lut_file = os.path.join(lut_path, "lookUpTable_" + str(mode) + ".csv")
-        lut = open(base_lut_file, "r", encoding="UTF-8")
-        counter = 0
-        for line in lut:
-            _, _, payout = line.strip().split(",")
-            all_modes_base_dist[mode][float(round(int(payout) / 100, 2))] += 1
-            counter += 1
-
-        total_mode_count[mode] = counter
+        payouts, counts = np.unique(load_lookup_table(base_lut_file)["payout"], return_counts=True)
+        all_modes_base_dist[mode] = {payout / 100: count for payout, count in zip(payouts.tolist(), counts.tolist())}
+        total_mode_count[mode] = int(counts.sum())
 
     # Segregate to win-ranges
     all_modes_range_hits = {}
@@ -49,7 +47,6 @@ def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name=
     combined_distributions = defaultdict(lambda: defaultdict(float))
     all_modes.append("cumulative")
     split = open(split_file, "r", encoding="UTF-8")
-    lut = open(lut_file, "r", encoding="UTF-8")
 
     all_base, all_free, all_fences = [], [], []
     for line in split:
@@ -60,10 +57,7 @@ def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name=
             idv_fence = base_mode_name
         all_fences.append(str(idv_fence))
 
-    all_weights = []
-    for line in lut:
-        _, weight, _ = line.strip().split(",")
-        all_weights.append(int(weight))
+    all_weights = load_lookup_table(lut_file)["weight"].tolist()
     total_lut_weight = int(sum(all_weights))
 
     for idx, _ in enumerate(all_weights):
@@ -99,35 +93,13 @@ def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name=
 
 def return_hit_rates(all_mode_distributions, total_weight, win_ranges, mode_cost):
     """Calculate hit-rates for game-type specific types."""
-    all_modes = list(all_mode_distributions.keys())
     all_mode_probs = {}
     all_mode_hits = {}
     all_mode_rtps = {}
-    for mode in all_modes:
-        all_mode_probs[mode] = {}
-        all_mode_hits[mode] = {}
-        all_mode_rtps[mode] = {}
-
-    for w in win_ranges:
-        for mode in all_modes:
-            all_mode_probs[mode][w] = 0
-            all_mode_rtps[mode][w] = 0
-
-    for mode in all_modes:
-        mode_wins = list(all_mode_distributions[mode].keys())
-        for win in mode_wins:
-            for win_range in win_ranges:
-                if win >= win_range[0] and win < win_range[1]:
-                    all_mode_probs[mode][win_range] += all_mode_distributions[mode][win] / total_weight
-                    all_mode_rtps[mode][win_range] += win * (all_mode_distributions[mode][win] / total_weight)
-                    continue
-
-        for win_range in win_ranges:
-            try:
-                all_mode_hits[mode][win_range] = round((1 / (all_mode_probs[mode][win_range])), 3)
-                all_mode_rtps[mode][win_range] /= mode_cost
-            except ZeroDivisionError:
-                all_mode_hits[mode][win_range] = "NaN"
+    for mode, distribution in all_mode_distributions.items():
+        all_mode_hits[mode], all_mode_probs[mode], all_mode_rtps[mode] = WinDistribution.from_dict(
+            distribution
+        ).range_statistics(win_ranges, total_weight, mode_cost)
 
     return all_mode_hits, all_mode_probs, all_mode_rtps
 
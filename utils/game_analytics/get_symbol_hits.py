@@ -2,7 +2,9 @@
 
 import json
 import os
+import numpy as np
 from src.config.paths import PATH_TO_GAMES
+from src.write_data.lookup_table import load_lookup_table
 
 
 class HitRateCalculations:
@@ -27,29 +29,17 @@ class HitRateCalculations:
             all_keys = [d.keys() for d in file_dict]
         f.close()
 
-        lut_ids = []
-        weights = []
-        payouts = []
-        with open(lut_file, "r", encoding="UTF-8") as f:
-            for line in f:
-                lut_ids.append(int(line.strip().split(",")[0]))
-                weights.append(int(line.strip().split(",")[1]))
-                payouts.append(float(line.strip().split(",")[2]))
-        f.close()
-
-        self.weights = weights
-        self.total_weight = sum(self.weights)
-        self.payouts = payouts
+        lookup = load_lookup_table(lut_file)
+        self.weights = lookup["weight"].astype(np.float64)
+        self.total_weight = float(self.weights.sum())
+        self.payouts = lookup["payout"].astype(np.float64)
         self.force_dict = file_dict
         self.all_keys = all_keys
 
     def get_hit_rates(self, unique_ids: list) -> float:
         """Get hit-rates using inverse probabilities from optimized lookup tables."""
-        cumulative_weight = 0
-        for idx in unique_ids:
-            cumulative_weight += self.weights[idx - 1]
-
-        prob = cumulative_weight / self.total_weight
+        cumulative_weight = self.weights[np.asarray(unique_ids, dtype=np.int64) - 1].sum()
+        prob = float(cumulative_weight) / self.total_weight
         try:
             return 1 / prob
         except ZeroDivisionError:
@@ -57,19 +47,13 @@ class HitRateCalculations:
 
     def get_av_wins(self, unique_ids: list) -> float:
         """Return average win amount for a specified list of simulation ids."""
-        search_key_tot_weight = 0
+        idx = np.asarray(unique_ids, dtype=np.int64) - 1
         # find out the total payout and weights from the force keys subset of the lookup table
-        for id in unique_ids:
-            search_key_tot_weight += self.weights[id - 1]
-        average_win = 0
-        # multiply each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
-        for id in unique_ids:
-            norm_payout = self.payouts[id - 1] * (self.weights[id - 1] / search_key_tot_weight)
-            average_win += norm_payout
-        try:
-            return average_win
-        except ZeroDivisionError:
+        search_key_tot_weight = self.weights[idx].sum()
+        if search_key_tot_weight == 0:
             return 0
+        # multiply each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
+        return float(np.sum(self.payouts[idx] * (self.weights[idx] / search_key_tot_weight)))
 
     def get_sim_count(self, search_key: dict) -> int:
         """Get raw sim count with partial or complete matches to force file keys."""
@@ -9,35 +9,35 @@ Obtain and compare file hash using SHA256
     [optional] -l the layer depth of the directory search, default to 1
     Example:
     python3 get_file_hash.py -d '../games/0_0_ways/library/lookup_tables/' -l 1
+
+    Hashes recorded when files were written (sha256_manifest.json) are used while the file size and modification time
+    are unchanged, pass --rehash to always read the files.
 """
 
 import os
-import hashlib
+import sys
 import argparse
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.write_data.file_hash import MANIFEST_NAME, get_file_sha256, hash_file  # noqa: E402
 
-def get_hash(filepath: str) -> str:
+def get_hash(filepath: str, rehash: bool = False) -> str:
     """Get hexadecimal representation of data file."""
-    sha_file = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            sha_file.update(data)
-    hexrep = sha_file.hexdigest()
-    return hexrep
+    if rehash:
+        return hash_file(filepath)
+    return get_file_sha256(filepath)
 
 
-def get_file_hash(*args: str) -> None:
+def get_file_hash(*args: str, rehash: bool = False) -> None:
     """Pass in a list of files to compare hash values"""
     hash_list = []
     for arg in args:
-        print(f"File: {arg.split('/')[-1]}\n{get_hash(arg)} \n\n")
-        hash_list.append(get_hash(arg))
+        print(f"File: {arg.split('/')[-1]}\n{get_hash(arg, rehash)} \n\n")
+        hash_list.append(get_hash(arg, rehash))
 
 
-def get_all_directory_hash(dir_path: str, folder_depth: int = 1) -> None:
+def get_all_directory_hash(dir_path: str, folder_depth: int = 1, rehash: bool = False) -> None:
     """Get all file-hash values from top-level directory"""
     files = []
     depth = 0
@@ -48,8 +48,8 @@ def get_all_directory_hash(dir_path: str, folder_depth: int = 1) -> None:
             break
 
     for f in files:
-        if not (f.endswith(".py")):
-            get_file_hash(f)
+        if not (f.endswith(".py")) and os.path.basename(f) != MANIFEST_NAME:
+            get_file_hash(f, rehash=rehash)
 
 
 if __name__ == "__main__":
@@ -57,9 +57,10 @@ if __name__ == "__main__":
     parser.add_argument("-f", dest="files", nargs="+")
     parser.add_argument("-d", dest="dirs")
     parser.add_argument("-l", dest="depth", default=1, type=int)
+    parser.add_argument("--rehash", action="store_true", help="Read files instead of using recorded hashes")
     arguments = parser.parse_args()
 
     if arguments.files:
-        get_file_hash(*arguments.files)
+        get_file_hash(*arguments.files, rehash=arguments.rehash)
     elif arguments.dirs:
-        get_all_directory_hash(arguments.dirs, arguments.depth)
+        get_all_directory_hash(arguments.dirs, arguments.depth, arguments.rehash)
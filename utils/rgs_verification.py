@@ -8,21 +8,11 @@ import os
 import importlib
 from io import TextIOWrapper
 import numpy as np
-import zstandard as zst
 import hashlib
 import pickle
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_distribution_moments,
-    get_distribution_average,
-    non_zero_hitrate,
-    prob_less_than_bet,
-    get_prob_no_win,
-    get_maxwin_hitrate,
-    get_distribution_median,
-    min_dist_difference,
-    calculate_rtp,
-)
+from src.write_data.book_writer import BookReader, get_book_decompressor, get_index_name
+from src.write_data.lookup_table import load_lookup_table
+from utils.analysis.distribution_functions import WinDistribution
 
 
 class WinStatistics:
@@ -80,32 +70,21 @@ class WinStatistics:
 
 def verify_lookup_format(filename: str) -> list:
     "Duplicate RGS verification before upload."
-    integer_payouts = []
-    running_weight_total = 0
-    min_win, max_win = None, None
-    win_distribution = make_win_distribution(filename)
-
-    with open(filename, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = float(weight)
-            payout = float(payout)
-
-            # Payout checks
-            assert payout.is_integer() and payout >= 0, "Payout mult be uint64 format:"
-            if payout > 0:
-                assert payout >= 10, "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
-            assert payout % 10 == 0, "Payout values must be in increments of 10."
-            integer_payouts.append(int(payout))
-
-            if (min_win is None) or (payout < min_win):
-                min_win = payout
-            if (max_win is None) or (payout > max_win):
-                max_win = payout
-            # Weight checks
-            assert weight.is_integer() and weight >= 0, "Weight must be uint64 format."
-            running_weight_total += weight
-
+    # Negative or non-integer values are rejected when the lookup table is parsed as uint64
+    lookup = load_lookup_table(filename)
+    win_distribution = WinDistribution.from_lookup(lookup).to_dict()
+    payouts = lookup["payout"]
+
+    # Payout checks
+    non_zero_payouts = payouts[payouts > 0]
+    assert np.all(non_zero_payouts >= 10), "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
+    assert np.all(payouts % 10 == 0), "Payout values must be in increments of 10."
+    integer_payouts = payouts.tolist()
+    min_win = float(payouts.min()) if len(payouts) > 0 else None
+    max_win = float(payouts.max()) if len(payouts) > 0 else None
+
+    # Weight checks
+    running_weight_total = float(np.sum(lookup["weight"], dtype=np.float64))
     assert running_weight_total <= np.iinfo(np.uint64).max, "Sum of weights must be <= MAX(uint64)"
 
     return win_distribution, integer_payouts, running_weight_total, min_win, max_win
@@ -113,7 +92,9 @@ def verify_lookup_format(filename: str) -> list:
 
 # payout mult value match to lut + length match
 def verify_books_and_payout_mults(books_filename: str) -> list:
-    """Ensure the values written to the books match those in the lookup table exactly."""
+    """Ensure the values written to the books match those in the lookup table exactly.
+    Book files are concatenated zstd frames (one per simulation batch), all frames are read. If a trained
+    dictionary (books_<mode>.dict) is stored next to the book file it is used for decompression."""
     assert str(books_filename).endswith(".jsonl.zstd") or str(books_filename).endswith(
         "jsonl.zst"
     ), "Verification is only run for compressed book files of format .jsonl.zst."
@@ -121,8 +102,8 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     book_payout_ints = []
     total_num_events = 0
     with open(books_filename, "rb") as f:
-        decompressor = zst.ZstdDecompressor()
-        with decompressor.stream_reader(f) as reader:
+        decompressor = get_book_decompressor(str(books_filename))
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = TextIOWrapper(reader, encoding="UTF-8")
             for line in txt_stream:
                 line = line.strip()
@@ -144,6 +125,19 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     return book_payout_ints, total_num_events
 
 
+def verify_book_index(books_filename: str, num_books: int) -> None:
+    """Ensure the frame index of a book file covers all books in order and spans the whole file."""
+    with BookReader(str(books_filename)) as reader:
+        assert reader.num_books == num_books, "Book index does not cover every book."
+        next_id, next_offset = reader.first_ids[0], 0
+        for first_id, frame_books, offset, size in reader.frames:
+            assert first_id == next_id and offset == next_offset, "Book index frames are not contiguous."
+            next_id, next_offset = first_id + frame_books, offset + size
+        assert next_offset == os.path.getsize(books_filename), "Book index does not span the book file."
+        for frame_index in [0, len(reader.frames) - 1]:
+            assert reader.get_book(reader.first_ids[frame_index])["id"] == reader.first_ids[frame_index]
+
+
 def compare_payout_values(book_int_payouts, lut_int_payouts) -> None:
     """Ensure payout multiplier values match between books and lookup tables."""
     book_ints = pickle.dumps(book_int_payouts)
@@ -160,35 +154,30 @@ def get_lut_statistics(
     win_distribution, bet_cost, unique_payouts, weight_range, min_win, max_win, num_events
 ) -> object:
     """Run RGS statistic tests for upload verification."""
-
-    var, std, skew, kurtosis = get_distribution_moments(win_distribution)
-    MathStats = WinStatistics(
-        win_distribution=win_distribution,
+    if isinstance(win_distribution, dict):
+        win_distribution = WinDistribution.from_dict(win_distribution)
+    stats = win_distribution.get_statistics(bet_cost)
+    return WinStatistics(
+        win_distribution=win_distribution.to_dict(),
         num_events=num_events,
         weight_range=weight_range,
         min_win=min_win,
         max_win=max_win,
-        min_diff=min_dist_difference(win_distribution),
+        min_diff=stats["min_diff"],
         unique_wins=unique_payouts,
-        average_wins=float(get_distribution_average(win_distribution)),
-        rtp=calculate_rtp(win_distribution, bet_cost, weight_range),
-        std=std,
-        var=var,
-        hr_max=get_maxwin_hitrate(win_distribution, weight_range),
-        non_zero_hr=non_zero_hitrate(win_distribution, weight_range),
-        prob_nil=get_prob_no_win(win_distribution, weight_range),
-        prob_less_bet=prob_less_than_bet(win_distribution, bet_cost, weight_range),
+        average_wins=stats["average_win"],
+        rtp=stats["rtp"],
+        std=stats["std"],
+        var=stats["var"],
+        m2m=stats["m2m"],
+        hr_max=stats["hr_max"],
+        non_zero_hr=stats["non_zero_hr"],
+        prob_nil=stats["prob_nil"],
+        prob_less_bet=stats["prob_less_bet"],
         num_non_zero_payouts=get_num_non_zero_payouts(unique_payouts),
-        skew=skew,
-        excess_kurtosis=kurtosis,
+        skew=stats["skew"],
+        excess_kurtosis=stats["excess_kurtosis"],
     )
-    median = get_distribution_median(win_distribution, weight_range)
-    if median > 0:
-        m2m = MathStats.average_win / median
-        MathStats.m2m = m2m
-    else:
-        MathStats.m2m = 0
-    return MathStats
 
 
 def execute_all_tests(config, excluded_modes=[]):
@@ -208,6 +197,8 @@ def execute_all_tests(config, excluded_modes=[]):
 
             win_dist, lut_payouts, weights_range, min_win, max_win = verify_lookup_format(lut_file)
             book_payouts, num_events = verify_books_and_payout_mults(book_file)
+            if os.path.exists(get_index_name(book_file)):
+                verify_book_index(book_file, len(book_payouts))
 
             compare_payout_values(book_payouts, lut_payouts)
 
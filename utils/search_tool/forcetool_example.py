@@ -12,6 +12,10 @@ def run(game: str, mode: str):
     match_ids = ForceObject.find_partial_key_match(single_serach_condition, mode)
     ForceObject.print_search_results(single_serach_condition, match_ids, "test_single_search.json", mode)
 
+    # Load the matching books directly from the indexed book file
+    example_book = ForceObject.load_books(match_ids)[0]
+    print("First matching book:", example_book["id"], "payout:", example_book["payoutMultiplier"])
+
     # Find the intersection of partial key matches
     multi_search_condition = [
         {"gametype": "basegame", "kind": "5", "symbol": "scatter"},
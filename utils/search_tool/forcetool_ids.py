@@ -5,6 +5,12 @@ import importlib
 import json
 from typing import List, Dict
 
+import numpy as np
+
+from src.write_data.book_writer import BookReader
+from src.write_data.force_index import ForceIndex
+from src.write_data.lookup_table import load_lookup_table
+
 
 def load_game_config(game_id: str):
     """Load game config class"""
@@ -28,6 +34,7 @@ class ForceTool:
     Pass in target search keys and return book-ids satisfying union of given keys.
     The force_record file could be uploaded if small enough, and polled by the front-end to search for game-keys
     Alternatively, this tool can be used to narrow down ids by finding the union of multiple keys.
+    If the bitmap force index (force_index_<mode>.npz) exists, searches use it instead of the force_record file.
     """
 
     def __init__(self, game_id: str, game_mode: str):
@@ -37,17 +44,44 @@ class ForceTool:
         self.current_force_file = None
         self.search_keys = None
         self.method = None  # For payout range search only
+        self.force_index = None
 
     def get_force_file_name(self):
         "Get force-file path."
         return os.path.join(self.config.library_path, "forces", f"force_record_{self.target_mode}.json")
 
+    def get_force_index_name(self):
+        "Get bitmap force index path."
+        return os.path.join(self.config.library_path, "forces", f"force_index_{self.target_mode}.npz")
+
+    def load_force_index(self) -> ForceIndex:
+        """Load the bitmap force index once, returns None if it has not been created."""
+        if self.force_index is None and os.path.exists(self.get_force_index_name()):
+            self.force_index = ForceIndex.load(self.get_force_index_name())
+        return self.force_index
+
+    def query(self) -> ForceIndex:
+        """Bitmap index for combined searches, i.e
+        (index.where(kind=5, symbol="H1") & ~index.where(gametype="freegame") & index.payout_range(100, 500)).ids()
+        """
+        assert self.load_force_index() is not None, "Force index not found, re-run create_books()."
+        return self.force_index
+
     def load_force_file(self):
         "Load JSON format force file."
         force_name = self.get_force_file_name()
         with open(force_name, "r", encoding="UTF-8") as f:
             self.current_force_file = json.loads(f.read())
 
+    def get_book_file_name(self):
+        "Get published (compressed) book file path."
+        return os.path.join(self.config.library_path, "publish_files", f"books_{self.target_mode}.jsonl.zst")
+
+    def load_books(self, simulation_ids) -> List[Dict]:
+        """Fetch the books of matched ids from the indexed book file, without decompressing the whole file."""
+        with BookReader(self.get_book_file_name()) as reader:
+            return reader.get_books(simulation_ids)
+
     def print_search_results(self, search_criteria, simulation_ids: List, filename: str, game_mode: str):
         """Record"""
         base_path = os.path.join(self.config.library_path, "forces")
@@ -79,6 +113,12 @@ class ForceTool:
         """
         assert search_keys is not None, "must specify serach keys and game_mode"
 
+        if self.load_force_index() is not None:
+            matched_book_ids = set(self.force_index.where(**search_keys).ids().tolist())
+            if len(matched_book_ids) == 0:
+                raise Warning("No book-ids found.")
+            return matched_book_ids
+
         if reload_force_json:
             self.load_force_file()
         matched_book_ids = set()
@@ -97,7 +137,8 @@ class ForceTool:
         Returns all id's appearing in multiplie search criteria
         """
         assert target_mode is not None, "Must specify game mode"
-        self.load_force_file()
+        if self.load_force_index() is None:
+            self.load_force_file()
 
         book_id_sets = []
         for _, search_key in enumerate(search_array):
@@ -133,20 +174,14 @@ class ForceTool:
                 self.config.library_path, "lookup_tables", f"lookUpTable_{self.target_mode}.csv"
             )
 
-        recorded_ids = []
-        with open(lookup_name, "r", encoding="UTF-8") as f:
-            lines = f.readlines()
-            for line in lines:
-                line_val = int(line.strip().split(",")[-1])
-                sim_id = int(line.strip().split(",")[0])
-                if (
-                    (self.method == "RANGE" and line_val >= min_payout and line_val < max_payout)
-                    or (self.method == "MAX" and line_val < max_payout)
-                    or (self.method == "MIN" and line_val < min_payout)
-                ):
-                    recorded_ids.append(sim_id)
-
-                    if count_limit is not None and len(recorded_ids) >= count_limit:
-                        break
+        lookup = load_lookup_table(lookup_name)
+        payouts = lookup["payout"].astype(np.int64)
+        if self.method == "RANGE":
+            mask = (payouts >= min_payout) & (payouts < max_payout)
+        elif self.method == "MAX":
+            mask = payouts < max_payout
+        else:
+            mask = payouts < min_payout
+        recorded_ids = lookup["id"][mask][:count_limit].tolist()
 
         return recorded_ids
@@ -10,6 +10,9 @@ ABS_PATH = Path(__file__).parent.parent
 sys.path.append(ABS_PATH)
 os.chdir(ABS_PATH)
 
+from src.write_data.file_hash import HashedFile  # noqa: E402
+from src.write_data.lookup_table import write_binary_lookup  # noqa: E402
+
 
 def swap_tables(game_name: str, game_mode: str, target_file_number: int):
     """Replace default optimization table."""
@@ -21,7 +24,7 @@ def swap_tables(game_name: str, game_mode: str, target_file_number: int):
 
     start_recording = False
 
-    with open(new_opt_file, "r", encoding="UTF-8") as infile, open(new_lut_file, "w", encoding="UTF-8") as outfile:
+    with open(new_opt_file, "r", encoding="UTF-8") as infile, HashedFile(new_lut_file) as outfile:
         for line in infile:
             line = line.strip()
             if not line:
@@ -34,11 +37,12 @@ def swap_tables(game_name: str, game_mode: str, target_file_number: int):
                     idx = int(parts[0])
                     weight = int(parts[1])
                     payout = int(round(float(parts[2]) * 100, 0))
-                    outfile.write(f"{idx},{weight},{payout}\n")
+                    outfile.write(f"{idx},{weight},{payout}\n".encode("UTF-8"))
                 except:
                     raise ValueError("Could not write transformed line.")
             elif line == "Distribution":
                 start_recording = True
+    write_binary_lookup(new_lut_file)
 
 
 def process_many_files(game_id, file_dict: dict) -> None: